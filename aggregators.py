@@ -0,0 +1,199 @@
+# aggregators.py
+"""
+Online (constant-memory) statistics for streaming benchmark results.
+
+Every aggregator takes values one at a time through add() and can be
+merged with another of its kind, so worker processes or partial runs can
+be combined without keeping the samples.
+"""
+import math
+import bisect
+import collections
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min and max of a stream."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min: self.min = x
+        if x > self.max: self.max = x
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) for streaming percentiles.
+
+    Values are buffered, then merged into at most ~`compression` centroids
+    whose size limit shrinks toward the tails, so p95/p99 stay accurate.
+    """
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+        self.count = 0
+
+    def add(self, x, weight=1):
+        self.buffer.append((x, weight))
+        self.count += weight
+        if len(self.buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other):
+        other._compress()
+        for m, w in zip(other.means, other.weights):
+            self.add(m, w)
+
+    def _compress(self):
+        if not self.buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self.buffer)
+        self.buffer = []
+        total = sum(w for _, w in points)
+        means, weights = [], []
+        cur_mean, cur_weight = points[0]
+        done = 0.0
+        for mean, weight in points[1:]:
+            q = (done + cur_weight + weight) / total
+            limit = 4 * total * q * (1 - q) / self.compression
+            if cur_weight + weight <= max(limit, 1):
+                cur_mean += (mean - cur_mean) * weight / (cur_weight + weight)
+                cur_weight += weight
+            else:
+                means.append(cur_mean); weights.append(cur_weight)
+                done += cur_weight
+                cur_mean, cur_weight = mean, weight
+        means.append(cur_mean); weights.append(cur_weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1); 0 for an empty digest."""
+        self._compress()
+        if not self.means:
+            return 0.0
+        if len(self.means) == 1:
+            return self.means[0]
+        target = q * self.count
+        # Each centroid sits at the middle of its weight span
+        cumulative = 0.0
+        centers = []
+        for w in self.weights:
+            centers.append(cumulative + w / 2)
+            cumulative += w
+        i = bisect.bisect_left(centers, target)
+        if i == 0:
+            return self.means[0]
+        if i == len(centers):
+            return self.means[-1]
+        lo, hi = centers[i - 1], centers[i]
+        frac = (target - lo) / (hi - lo) if hi > lo else 0.0
+        return self.means[i - 1] + (self.means[i] - self.means[i - 1]) * frac
+
+
+class Histogram:
+    """Counts of discrete values (e.g. guesses per game)."""
+    def __init__(self):
+        self.counts = collections.Counter()
+
+    def add(self, value):
+        self.counts[value] += 1
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+
+
+class BenchmarkStats:
+    """All the aggregates a benchmark reports, updated one game record at a time."""
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.time = RunningStats()
+        self.memory = RunningStats()
+        self.nodes = RunningStats()
+        self.guesses = RunningStats()
+        self.solve = RunningStats()
+        self.filter = RunningStats()
+        self.solve_digest = TDigest()
+        self.filter_digest = TDigest()
+        self.move_digest = TDigest()
+        self.outcomes = Histogram()  # guesses used, or "X" for a loss
+
+    def add(self, rec):
+        self.games += 1
+        if rec["won"]: self.wins += 1
+        if rec["time"] is not None: self.time.add(rec["time"])
+        if rec["memory"] is not None: self.memory.add(rec["memory"])
+        self.nodes.add(rec["nodes"])
+        self.guesses.add(rec["guesses"])
+        self.outcomes.add(rec["guesses"] if rec["won"] else "X")
+        for s, f in zip(rec["solve_times"], rec["filter_times"]):
+            self.solve.add(s); self.solve_digest.add(s)
+            self.filter.add(f); self.filter_digest.add(f)
+            self.move_digest.add(s + f)
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        for name in ("time", "memory", "nodes", "guesses", "solve", "filter",
+                     "solve_digest", "filter_digest", "move_digest", "outcomes"):
+            getattr(self, name).merge(getattr(other, name))
+
+    def snapshot(self):
+        """The stats dict shown by the dashboard ({} before the first game)."""
+        if not self.games: return {}
+
+        def peak(s): return s.max if s.count else 0
+
+        return {
+            "games": self.games,
+
+            "avg_time": self.time.mean,
+            "max_time": peak(self.time),
+
+            "avg_mem": self.memory.mean,
+            "max_mem": peak(self.memory),
+
+            "avg_nodes": self.nodes.mean,
+            "max_nodes": peak(self.nodes),
+
+            "avg_guesses": self.guesses.mean,
+            "max_guesses": peak(self.guesses),
+
+            # Per-turn phase latency (timing passes only)
+            "avg_solve": self.solve.mean,
+            "p95_solve": self.solve_digest.quantile(0.95),
+            "avg_filter": self.filter.mean,
+            "p95_filter": self.filter_digest.quantile(0.95),
+
+            "win_rate": (self.wins / self.games) * 100,
+            "outcomes": dict(self.outcomes.counts)  # guesses used (or "X") -> games
+        }
@@ -1,77 +1,342 @@
 # benchmark.py
+import os
 import time
+import contextlib
+import queue
+import random
+import itertools
+import threading
 import tracemalloc
-import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import instrument
+from aggregators import BenchmarkStats
+from config import Config
 from game import WordleGame
+from opening_book import OpeningBook
+from patterns import PatternTable
+from constraints import ConstraintIndex
+
+MAX_ATTEMPTS = 6
+
+
+def play_game(game, solver, track_memory=False):
+    """
+    Plays one game to the end; returns the per-game record.
+
+    tracemalloc slows down every allocation, so a game is either timed
+    (track_memory=False: total and per-phase latency) or traced for its peak
+    memory (track_memory=True: timings are left out of the record).
+    """
+    solver.reset()
+
+    if track_memory: tracemalloc.start()
+    clock = time.perf_counter
+    start_time = clock()
+
+    attempts = 0
+    won = False
+    path = []
+    solve_times, filter_times = [], []
+
+    while attempts < MAX_ATTEMPTS:
+        t0 = clock()
+        guess = solver.solve_step()
+        t1 = clock()
+        if not guess: break
+        attempts += 1
+        path.append(guess)
+
+        feedback = game.check_guess(guess)
+        t2 = clock()
+        solver.filter_candidates(guess, feedback)
+        t3 = clock()
+        solve_times.append((t1 - t0) * 1_000_000)
+        filter_times.append((t3 - t2) * 1_000_000)
+
+        if all(f == 2 for f in feedback):
+            won = True
+            break
+
+    end_time = clock()
+    peak = None
+    if track_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "secret": game.secret_word,
+        "time": None if track_memory else (end_time - start_time) * 1_000_000, # Microseconds
+        "solve_times": [] if track_memory else solve_times, # Microseconds per turn
+        "filter_times": [] if track_memory else filter_times,
+        "memory": peak, # Bytes
+        "nodes": solver.nodes_expanded,
+        "guesses": attempts,
+        "path": path,
+        "won": won
+    }
+
+
+def measure_game(game, solver, measure_memory=True):
+    """Timing pass, then (optionally) a separate memory pass over the same secret."""
+    rec = play_game(game, solver)
+    if measure_memory:
+        # Only the timing pass is profiled
+        profiler = instrument.disable()
+        try:
+            rec["memory"] = play_game(game, solver, track_memory=True)["memory"]
+        finally:
+            if profiler is not None: instrument.enable(profiler)
+    return rec
+
+
+# --- Streaming pipeline: secret source -> game player -> per-game records ---
+def secret_stream(word_list, num_games, rng):
+    """`num_games` random secrets drawn from `rng` (same seed, same secrets)."""
+    for _ in range(num_games):
+        yield rng.choice(word_list)
+
+def play_stream(secrets, game, solver, measure_memory=True, opening_book=None):
+    """Plays one game per secret, reusing one game and solver; yields records."""
+    for secret in secrets:
+        game.reset_game(secret)
+        solver.opening_book = opening_book
+        yield measure_game(game, solver, measure_memory)
+
+def compact_record(rec):
+    """Per-game fields kept when a caller asks for the individual games."""
+    return {k: rec[k] for k in ("secret", "guesses", "won", "time", "nodes", "memory")}
+
+
+# --- Worker process state ---
+# Set once per process by _init_worker so tasks only carry a chunk of secrets;
+# the pattern table is memory-mapped from the cache and shared via the page cache.
+_worker = {}
+
+def _init_worker(word_list, guess_list, algo_class, use_table, measure_memory, keep_records, hard_mode,
+                 profile=None):
+    table = PatternTable.load(word_list, guess_list) if use_table else None
+    game = WordleGame(word_list, table, None if use_table else ConstraintIndex(word_list), hard_mode, guess_list)
+    solver = algo_class(game)
+    _worker.update(game=game, solver=solver, measure_memory=measure_memory, keep_records=keep_records,
+                   opening_book=OpeningBook.load(algo_class, word_list, hard_mode=hard_mode, guess_list=guess_list),
+                   profile=profile)
+
+def _play_chunk(secrets):
+    """Aggregates a chunk inside the worker; only the aggregate (and chunk profile) travels back."""
+    stats = BenchmarkStats()
+    records = [] if _worker["keep_records"] else None
+    # profile: None (off), or whether to keep trace events
+    profiler = instrument.Profiler(trace=_worker["profile"]) if _worker["profile"] is not None else None
+    with profiler if profiler is not None else contextlib.nullcontext():
+        for rec in play_stream(secrets, _worker["game"], _worker["solver"],
+                               _worker["measure_memory"], _worker["opening_book"]):
+            stats.add(rec)
+            if records is not None: records.append(compact_record(rec))
+    return stats, records, profiler
+
+def _init_compare(events, cancel):
+    _worker.update(events=events, cancel=cancel)
+
+def _run_solver(name, word_list, guess_list, algo_class, secrets, use_table, measure_memory, report_every,
+                hard_mode, profile):
+    """One solver's whole run in its own process; partial stats go to the shared queue."""
+    table = PatternTable.load(word_list, guess_list) if use_table else None
+    bench = PerformanceBenchmark(word_list, algo_class, pattern_table=table, measure_memory=measure_memory,
+                                 hard_mode=hard_mode, guess_list=guess_list, profile=profile)
+    events, cancel = _worker["events"], _worker["cancel"]
+    last_report = [0.0]
+
+    def on_progress(done, total):
+        if cancel.is_set(): bench.cancel()
+        now = time.perf_counter()
+        if done == total or now - last_report[0] >= report_every:
+            last_report[0] = now
+            events.put((name, done, total, bench.stats))
+
+    bench.run(progress_callback=on_progress, secrets=secrets)
+    return name, bench.stats, bench.profiler
+
+
+class SolverComparison:
+    """
+    Runs several solvers at the same time, one process each, on the same
+    secrets. Wall time is that of the slowest solver (given enough cores),
+    not the sum. Worker processes are spawned rather than forked, so this
+    is safe to start from a GUI thread.
+    """
+    REPORT_EVERY = 0.2 # Seconds between partial stats sent by each solver process
+
+    def __init__(self, word_list, solver_classes, secrets, pattern_table=None, measure_memory=True,
+                 hard_mode=Config.HARD_MODE, guess_list=None, profile=False):
+        self.word_list = word_list
+        # Allowed guesses (default: the pattern table's, else the word list)
+        self.guess_list = guess_list if guess_list is not None else \
+            (pattern_table.guesses if pattern_table is not None else word_list)
+        self.solver_classes = dict(solver_classes)
+        self.secrets = list(secrets)
+        self.use_table = pattern_table is not None
+        self.measure_memory = measure_memory
+        self.hard_mode = hard_mode
+        self.context = multiprocessing.get_context("spawn")
+        self.cancelled = self.context.Event()
+        self.stats = {name: BenchmarkStats() for name in self.solver_classes}
+        # Each solver process profiles its own run (see instrument.py)
+        self.profile = profile
+        self.profilers = {}
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self, progress_callback=None):
+        """
+        Blocks until every solver is done (or cancelled); returns {name: stats dict},
+        with a "profile" summary per solver when profiling.
+        progress_callback(name, done, total, stats) runs in the calling thread.
+        """
+        if self.use_table:
+            PatternTable.load(self.word_list, self.guess_list) # build the cache once, before the workers map it
+        events = self.context.Queue()
+        total = len(self.secrets)
+
+        def drain():
+            while True:
+                try:
+                    name, done, _, stats = events.get_nowait()
+                except queue.Empty:
+                    return
+                self.stats[name] = stats
+                if progress_callback: progress_callback(name, done, total, stats.snapshot())
+
+        with ProcessPoolExecutor(max_workers=len(self.solver_classes), mp_context=self.context,
+                                 initializer=_init_compare, initargs=(events, self.cancelled)) as pool:
+            pending = {pool.submit(_run_solver, name, self.word_list, self.guess_list, algo_class, self.secrets,
+                                   self.use_table, self.measure_memory, self.REPORT_EVERY, self.hard_mode,
+                                   self.profile)
+                       for name, algo_class in self.solver_classes.items()}
+            while pending:
+                finished, pending = wait(pending, timeout=self.REPORT_EVERY, return_when=FIRST_COMPLETED)
+                drain()
+                for future in finished:
+                    name, stats, profiler = future.result()
+                    self.stats[name] = stats
+                    if profiler is not None: self.profilers[name] = profiler
+                    if progress_callback: progress_callback(name, stats.games, total, stats.snapshot())
+        results = {name: stats.snapshot() for name, stats in self.stats.items()}
+        for name, profiler in self.profilers.items():
+            if results[name]: results[name]["profile"] = profiler.summary()
+        return results
+
 
 class PerformanceBenchmark:
-    def __init__(self, word_list, algo_class, num_games=10):
+    def __init__(self, word_list, algo_class, num_games=10, pattern_table=None, seed=None, measure_memory=True,
+                 keep_records=False, hard_mode=Config.HARD_MODE, guess_list=None, profile=False, trace=False):
         self.word_list = word_list
+        # Allowed guesses (default: the pattern table's, else the word list)
+        self.guess_list = guess_list if guess_list is not None else \
+            (pattern_table.guesses if pattern_table is not None else word_list)
         self.algo_class = algo_class
+        self.pattern_table = pattern_table
+        self.hard_mode = hard_mode
+        # Without a pattern table, filtering falls back to constraint bitsets
+        self.constraint_index = ConstraintIndex(word_list) if pattern_table is None else None
+        # Reuse a prebuilt opening book (see opening_book.py) if one exists
+        self.opening_book = OpeningBook.load(algo_class, word_list, hard_mode=hard_mode, guess_list=self.guess_list)
         self.num_games = num_games
-        self.results = {
-            "times": [],
-            "memory": [],
-            "nodes": [],
-            "guesses": [],
-            "wins": 0
-        }
+        self.measure_memory = measure_memory
+        # Same seed -> same secrets, whatever the algorithm
+        self.rng = random.Random(seed)
+        # Online aggregates: memory stays constant however many games are played.
+        # Individual games are only kept (compactly) when keep_records is set.
+        self.stats = BenchmarkStats()
+        self.records = [] if keep_records else None
+        # Set from any thread to stop a run after the current game / chunk
+        self.cancelled = threading.Event()
+        # Hot-path counters and phase times of the timing passes (see
+        # instrument.py); `trace` also keeps Chrome trace events
+        self.profiler = instrument.Profiler(trace=trace) if profile or trace else None
 
-    def run(self, progress_callback=None):
-        for i in range(self.num_games):
-            game = WordleGame(self.word_list)
-            solver = self.algo_class(game)
-            
-            tracemalloc.start()
-            start_time = time.perf_counter()
-            
-            attempts = 0
-            won = False
-            
-            while attempts < 6:
-                guess = solver.solve_step()
-                if not guess: break
-                attempts += 1
-                
-                feedback = game.check_guess(guess)
-                solver.filter_candidates(guess, feedback)
-                
-                if all(f == 2 for f in feedback):
-                    won = True
-                    break
-            
-            end_time = time.perf_counter()
-            current, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
-            
-            # Record Data
-            self.results["times"].append((end_time - start_time) * 1_000_000) # Microseconds
-            self.results["memory"].append(peak) # Bytes
-            self.results["nodes"].append(solver.nodes_expanded)
-            self.results["guesses"].append(attempts)
-            if won: self.results["wins"] += 1
-            
-            if progress_callback: 
-                progress_callback(i + 1, self.num_games)
-
-        return self.calculate_stats()
-
-    def calculate_stats(self):
-        r = self.results
-        if not r["times"]: return {}
-        
-        return {
-            "avg_time": statistics.mean(r["times"]),
-            "max_time": max(r["times"]),
-            
-            "avg_mem": statistics.mean(r["memory"]),
-            "max_mem": max(r["memory"]),
-            
-            "avg_nodes": statistics.mean(r["nodes"]),
-            "max_nodes": max(r["nodes"]),
-            
-            "avg_guesses": statistics.mean(r["guesses"]),
-            "max_guesses": max(r["guesses"]),
-            
-            "win_rate": (r["wins"] / self.num_games) * 100
-        }
\ No newline at end of file
+    def cancel(self):
+        self.cancelled.set()
+
+    def record(self, rec):
+        self.stats.add(rec)
+        if self.records is not None: self.records.append(compact_record(rec))
+
+    def run(self, progress_callback=None, secrets=None):
+        """
+        Plays `num_games` seeded random games, or one game per given secret
+        (any iterable, consumed lazily). calculate_stats() may be called from
+        progress_callback to show partial results. A cancelled run stops
+        between games and returns the stats of the games played so far.
+        """
+        if secrets is None:
+            secrets = secret_stream(self.word_list, self.num_games, self.rng)
+        elif hasattr(secrets, "__len__"):
+            self.num_games = len(secrets)
+        game = WordleGame(self.word_list, self.pattern_table, self.constraint_index, self.hard_mode, self.guess_list)
+        solver = self.algo_class(game)
+        with self.profiler if self.profiler is not None else contextlib.nullcontext():
+            for i, rec in enumerate(play_stream(secrets, game, solver, self.measure_memory, self.opening_book)):
+                self.record(rec)
+                if progress_callback:
+                    progress_callback(i + 1, self.num_games)
+                if self.cancelled.is_set(): break
+
+        return self.calculate_stats(include_profile=True)
+
+    def run_parallel(self, secrets=None, workers=None, chunk_size=None, progress_callback=None):
+        """
+        Plays one game per secret (default: the whole word list) across a
+        process pool. Workers receive the word list once at start-up, then
+        chunks of secrets; each returns the aggregate of its chunk. At most
+        two chunks per worker are in flight, so `secrets` may be a stream.
+        Cancelling stops the submission of new chunks; those in flight finish.
+        """
+        if secrets is None:
+            secrets = self.word_list
+        if hasattr(secrets, "__len__"):
+            self.num_games = len(secrets)
+        workers = workers or os.cpu_count() or 1
+        chunk_size = chunk_size or max(1, min(500, self.num_games // (workers * 8)))
+
+        use_table = self.pattern_table is not None
+        if use_table:
+            PatternTable.load(self.word_list, self.guess_list) # make sure the cache file exists before the workers map it
+
+        source = iter(secrets)
+        done = 0
+        profile = None if self.profiler is None else self.profiler.events is not None
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.word_list, self.guess_list, self.algo_class, use_table,
+                                           self.measure_memory, self.records is not None, self.hard_mode,
+                                           profile)) as pool:
+            pending = set()
+            while True:
+                while len(pending) < 2 * workers and not self.cancelled.is_set():
+                    chunk = list(itertools.islice(source, chunk_size))
+                    if not chunk: break
+                    pending.add(pool.submit(_play_chunk, chunk))
+                if not pending: break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stats, records, profiler = future.result()
+                    self.stats.merge(stats)
+                    if profiler is not None: self.profiler.merge(profiler)
+                    if records is not None: self.records.extend(records)
+                    done += stats.games
+                    if progress_callback:
+                        progress_callback(done, max(done, self.num_games))
+
+        return self.calculate_stats(include_profile=True)
+
+    def calculate_stats(self, include_profile=False):
+        """
+        Snapshot of the aggregates. The profile summary is only added on
+        request, once a run is over: the profiler is not safe to read from
+        another thread while games are being played.
+        """
+        stats = self.stats.snapshot()
+        if include_profile and stats and self.profiler is not None:
+            stats["profile"] = self.profiler.summary()
+        return stats
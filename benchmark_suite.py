@@ -0,0 +1,259 @@
+# benchmark_suite.py
+"""
+Headless, reproducible comparison of every registered solver.
+
+All solvers play the same secrets (a seeded sample or the whole word list),
+so their results can be compared game by game:
+
+    python benchmark_suite.py --games 500 --seed 7 --json report.json --csv games.csv
+    python benchmark_suite.py --exhaustive --workers 8 --solvers Entropy A*
+    python benchmark_suite.py --all-lengths --hard --games 200
+"""
+import csv
+import json
+import math
+import random
+import argparse
+import os
+import itertools
+from statistics import NormalDist, mean, stdev
+from config import Config
+from benchmark import PerformanceBenchmark, MAX_ATTEMPTS
+from instrument import format_summary
+from patterns import PatternTable, HAS_NUMPY
+from solvers import SOLVER_REGISTRY
+from utils import load_words, load_guesses, words_file
+
+FAILED_SCORE = MAX_ATTEMPTS + 1  # a lost game counts as one guess worse than the limit
+
+
+def select_secrets(word_list, games=100, seed=0, exhaustive=False):
+    if exhaustive:
+        return list(word_list)
+    return random.Random(seed).sample(word_list, min(games, len(word_list)))
+
+
+def game_scores(bench):
+    """secret -> guesses used (FAILED_SCORE for a loss)."""
+    return {rec["secret"]: (rec["guesses"] if rec["won"] else FAILED_SCORE) for rec in bench.records}
+
+
+def latency_summary(digest):
+    return {
+        "moves": digest.count,
+        "p50": digest.quantile(0.50),
+        "p95": digest.quantile(0.95),
+        "p99": digest.quantile(0.99),
+    }
+
+
+def summarize(bench, stats):
+    agg = bench.stats
+    distribution = agg.outcomes.counts
+    return {
+        "games": agg.games,
+        "win_rate": stats["win_rate"],
+        "avg_guesses": stats["avg_guesses"],
+        "guess_distribution": {str(k): distribution[k] for k in list(range(1, MAX_ATTEMPTS + 1)) + ["X"]},
+        "game_time_us": {"avg": stats["avg_time"], "max": stats["max_time"]},
+        "move_latency_us": latency_summary(agg.move_digest),
+        "solve_step_us": latency_summary(agg.solve_digest),
+        "filter_candidates_us": latency_summary(agg.filter_digest),
+        "avg_nodes": stats["avg_nodes"],
+        "max_mem": stats["max_mem"],
+        "avg_mem": stats["avg_mem"],
+        **({"profile": stats["profile"]} if "profile" in stats else {}),
+    }
+
+
+def _beta_fraction(a, b, x, eps=1e-14, max_terms=300):
+    """Continued fraction of the regularized incomplete beta function (modified Lentz)."""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, max_terms + 1):
+        for num in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                    -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < eps:
+            break
+    return h
+
+
+def incomplete_beta(a, b, x):
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_fraction(a, b, x) / a
+    return 1.0 - front * _beta_fraction(b, a, 1.0 - x) / b
+
+
+def student_t_p(t, df):
+    """Two-sided p-value of a Student t statistic with `df` degrees of freedom."""
+    return incomplete_beta(df / 2, 0.5, df / (df + t * t))
+
+
+def paired_comparison(scores_a, scores_b):
+    """
+    Paired tests on per-secret guess counts (negative mean_diff: A is better).
+    The t-test uses the Student t distribution with n-1 degrees of freedom;
+    the Wilcoxon p-value uses the normal approximation (with the tie
+    correction), which is rough below ten or so non-zero differences.
+    """
+    common = [s for s in scores_a if s in scores_b]
+    diffs = [scores_a[s] - scores_b[s] for s in common]
+    n = len(diffs)
+    result = {"pairs": n, "mean_diff": mean(diffs) if diffs else 0.0,
+              "a_better": sum(d < 0 for d in diffs), "b_better": sum(d > 0 for d in diffs),
+              "t_stat": None, "t_p": None, "wilcoxon_z": None, "wilcoxon_p": None}
+    normal = NormalDist()
+
+    # Paired t-test
+    if n > 1:
+        sd = stdev(diffs)
+        if sd > 0:
+            t = result["mean_diff"] / (sd / math.sqrt(n))
+            result["t_stat"] = t
+            result["t_p"] = student_t_p(t, n - 1)
+
+    # Wilcoxon signed-rank test (zero differences dropped, ties get average ranks)
+    nonzero = sorted((abs(d), d > 0) for d in diffs if d != 0)
+    m = len(nonzero)
+    if m > 0:
+        w_plus = 0.0
+        tie_term = 0
+        i = 0
+        while i < m:
+            j = i
+            while j < m and nonzero[j][0] == nonzero[i][0]:
+                j += 1
+            avg_rank = (i + 1 + j) / 2
+            w_plus += avg_rank * sum(positive for _, positive in nonzero[i:j])
+            tie_term += (j - i) ** 3 - (j - i)
+            i = j
+        expected = m * (m + 1) / 4
+        variance = m * (m + 1) * (2 * m + 1) / 24 - tie_term / 48
+        if variance > 0:
+            z = (w_plus - expected) / math.sqrt(variance)
+            result["wilcoxon_z"] = z
+            result["wilcoxon_p"] = 2 * (1 - normal.cdf(abs(z)))
+    return result
+
+
+def run_suite(word_list, solver_classes, secrets, pattern_table=None, workers=1, progress_callback=None,
+              measure_memory=True, hard_mode=Config.HARD_MODE, guess_list=None, profile=False, trace=False):
+    """Runs every solver on `secrets`; returns (report dict, {name: benchmark})."""
+    benches = {}
+    for name, solver_class in solver_classes.items():
+        bench = PerformanceBenchmark(word_list, solver_class, pattern_table=pattern_table,
+                                     measure_memory=measure_memory, keep_records=True, hard_mode=hard_mode,
+                                     guess_list=guess_list, profile=profile, trace=trace)
+        cb = (lambda done, total, name=name: progress_callback(name, done, total)) if progress_callback else None
+        if workers > 1:
+            stats = bench.run_parallel(secrets, workers=workers, progress_callback=cb)
+        else:
+            stats = bench.run(progress_callback=cb, secrets=secrets)
+        benches[name] = (bench, stats)
+
+    report = {
+        "games": len(secrets),
+        "word_length": len(word_list[0]) if word_list else Config.WORD_LENGTH,
+        "hard_mode": hard_mode,
+        "solvers": {name: summarize(bench, stats) for name, (bench, stats) in benches.items()},
+        "comparisons": [],
+    }
+    scores = {name: game_scores(bench) for name, (bench, _) in benches.items()}
+    for a, b in itertools.combinations(benches, 2):
+        report["comparisons"].append(dict(a=a, b=b, **paired_comparison(scores[a], scores[b])))
+    return report, {name: bench for name, (bench, _) in benches.items()}
+
+
+def write_csv(path, runs):
+    """One row per (word length, solver, game); `runs` maps a word length to its benches."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["length", "solver", "secret", "guesses", "won", "time_us", "nodes", "memory_b"])
+        for length, benches in runs.items():
+            for name, bench in benches.items():
+                for rec in bench.records:
+                    writer.writerow([length, name, rec["secret"], rec["guesses"], rec["won"], rec["time"],
+                                     rec["nodes"], "" if rec["memory"] is None else rec["memory"]])
+
+
+def print_report(report):
+    mode = ", hard mode" if report["hard_mode"] else ""
+    print(f"{report['word_length']} letters{mode}: {report['games']} games per solver")
+    for name, s in report["solvers"].items():
+        lat = s["move_latency_us"]
+        dist = " ".join(f"{k}:{v}" for k, v in s["guess_distribution"].items())
+        print(f"  {name:8} win {s['win_rate']:6.2f}%  avg {s['avg_guesses']:.3f}  "
+              f"move p50/p95/p99 {lat['p50']:.0f}/{lat['p95']:.0f}/{lat['p99']:.0f} us  [{dist}]")
+        if "profile" in s:
+            for line in format_summary(s["profile"]):
+                print(f"      {line}")
+    for c in report["comparisons"]:
+        p = "n/a" if c["wilcoxon_p"] is None else f"{c['wilcoxon_p']:.4g}"
+        print(f"  {c['a']} vs {c['b']}: mean diff {c['mean_diff']:+.3f} guesses, "
+              f"{c['a_better']}/{c['b_better']} games better, Wilcoxon p={p}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every solver on the same secrets and compare them.")
+    parser.add_argument("--solvers", nargs="*", default=None, help="solver names (default: all)")
+    parser.add_argument("--games", type=int, default=100, help="secrets sampled when not exhaustive")
+    parser.add_argument("--seed", type=int, default=Config.BENCHMARK_SEED, help="seed for the secret sample")
+    parser.add_argument("--exhaustive", action="store_true", help="play every word of the list as the secret")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes per solver")
+    parser.add_argument("--words", default=None, help="word list file (default: the list for each length)")
+    parser.add_argument("--guesses", default=None, help="allowed-guess list (default: the list for each length)")
+    parser.add_argument("--lengths", type=int, nargs="*", default=[Config.WORD_LENGTH], help="word lengths to run")
+    parser.add_argument("--all-lengths", action="store_true", help="run every length in Config.WORD_LENGTHS")
+    parser.add_argument("--hard", action="store_true", help="play in hard mode")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc passes")
+    parser.add_argument("--profile", action="store_true", help="count hot-path work and time each phase")
+    parser.add_argument("--trace", help="write a Chrome trace per solver (PATH.<length>.<solver>.json)")
+    parser.add_argument("--json", help="write the report as JSON")
+    parser.add_argument("--csv", help="write per-game records as CSV")
+    args = parser.parse_args()
+
+    lengths = list(Config.WORD_LENGTHS) if args.all_lengths else args.lengths
+    names = args.solvers or list(SOLVER_REGISTRY)
+    reports, runs = {}, {}
+    for length in lengths:
+        words = load_words(args.words, length)
+        if not words:
+            print(f"{length} letters: skipped (no {length}-letter words in {args.words or words_file(length)})")
+            continue
+        guesses = load_guesses(words, args.guesses)
+        table = PatternTable.load(words, guesses) if HAS_NUMPY else None
+        solver_classes = {name: SOLVER_REGISTRY[name] for name in names
+                          if table is not None or not SOLVER_REGISTRY[name].REQUIRES_TABLE}
+
+        secrets = select_secrets(words, args.games, args.seed, args.exhaustive)
+        report, runs[length] = run_suite(words, solver_classes, secrets, table, args.workers,
+                                         measure_memory=not args.no_memory, hard_mode=args.hard, guess_list=guesses,
+                                         profile=args.profile, trace=bool(args.trace))
+        report["seed"] = None if args.exhaustive else args.seed
+        print_report(report)
+        reports[length] = report
+        if args.trace:
+            root = os.path.splitext(args.trace)[0]
+            for name, bench in runs[length].items():
+                path = f"{root}.{length}.{name.replace('*', 'star')}.json"
+                print(f"  trace -> {bench.profiler.write_trace(path)}")
+    if args.json:
+        # A single length keeps the flat report; several are keyed by length
+        with open(args.json, "w") as f:
+            json.dump(reports.get(lengths[0], {}) if len(lengths) == 1
+                      else {str(length): report for length, report in reports.items()}, f, indent=2)
+    if args.csv:
+        write_csv(args.csv, runs)
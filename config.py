@@ -2,6 +2,34 @@
 
 class Config:
     WORD_LENGTH = 5
+    WORD_LENGTHS = (4, 5, 6, 7, 8)  # Variants covered by `benchmark_suite.py --all-lengths`
+    WORDS_FILE = "words.txt"
+    WORDS_FILE_PATTERN = "words{length}.txt"  # Per-length list, used instead of WORDS_FILE when present
+    GUESSES_FILE = "guesses.txt" # Extra allowed guesses that are never answers (optional)
+    GUESSES_FILE_PATTERN = "guesses{length}.txt"
+    HARD_MODE = False            # Revealed hints must be used in later guesses
+    CACHE_DIR = ".cache"         # On-disk caches (pattern tables, ...)
+    PATTERN_CACHE_TABLES = 4     # Pattern tables cached per word length (least recently used are dropped)
+    BOOK_DEPTH = 2               # Turns covered by a default opening book
+    BENCHMARK_SEED = 2024        # Shared secret sequence for solver comparisons
+    STARTUP_BUDGET_MS = 1000     # Cold-start budget checked by `main.py --startup-check`
+    LOOKAHEAD_DEPTH = 2          # Guesses searched ahead by the Lookahead/Minimax solvers
+    LOOKAHEAD_BEAM = 8           # Guesses tried per search node (lowest bound first)
+    LOOKAHEAD_BUDGET_MS = None   # Optional time cap per Lookahead/Minimax move without a deadline (None: full depth)
+    AUTO_STEP_BUDGET_MS = 300    # Time a GUI auto-solve step may spend searching
+    AUTO_STEP_DELAY_MS = 1000    # Time each auto-solve guess stays on screen before the next
+    SOLVER_POLL_MS = 20          # How often the GUI checks the solver worker for a guess
+    FRAME_MS = 16                # GUI redraw interval; widget and log updates are batched per frame
+    LOG_MAX_LINES = 500          # Lines kept in the GUI game log (older lines are dropped)
+    ANALYSIS_TOP_K = 8           # Next guesses listed in the GUI analysis panel
+    ANALYSIS_UPDATE_MS = 100     # Minimum time between partial analysis results
+    DASHBOARD_POLL_MS = 50       # How often the benchmark dashboard drains its worker queue
+    SERVER_HOST = "127.0.0.1"    # Address `server.py` listens on
+    SERVER_PORT = 8765
+    SERVER_WORKERS = 4           # Executor threads running the service's solve steps
+    SERVER_MAX_SESSIONS = 1000   # Open sessions before the least recently used is evicted
+    SERVER_SESSION_TTL_S = 600   # Idle time after which a session is evicted
+    SERVER_STEP_BUDGET_MS = 300  # Default time budget of a service solve step
     
     # --- THEME: LIGHT YELLOW (LEMON) ---
     COLOR_BG = "#FFF9C4"        # Light Yellow Background
@@ -0,0 +1,82 @@
+# constraints.py
+from wordbank import WordBank
+
+
+class ConstraintIndex:
+    """
+    Letter-constraint bitsets over a word list, built once.
+
+    Bit i of every set stands for word i. Python ints are used as the
+    bitsets, so a guess's feedback turns into a handful of AND / AND-NOT
+    operations and filtering cost depends on the number of constraints,
+    not on the number of words:
+
+        at[pos][letter]        words with `letter` at `pos`
+        min_count[letter][k]   words containing `letter` at least k times
+    """
+    def __init__(self, words):
+        self.words = WordBank.of(words)
+        self.word_length = self.words.word_length
+        self.full = self.words.full_mask
+
+        length = self.word_length
+        at_ids = [[[] for _ in range(26)] for _ in range(length)]
+        count_ids = [[[] for _ in range(length + 2)] for _ in range(26)]
+        for i, word in enumerate(self.words):
+            seen = {}
+            for pos, ch in enumerate(word):
+                c = ord(ch) - 97
+                at_ids[pos][c].append(i)
+                seen[c] = seen.get(c, 0) + 1
+            for c, n in seen.items():
+                for k in range(1, n + 1):
+                    count_ids[c][k].append(i)
+
+        self.at = [[self.bits_for(ids) for ids in row] for row in at_ids]
+        self.min_count = [[self.full] + [self.bits_for(ids) for ids in row[1:]] for row in count_ids]
+
+    def bits_for(self, ids):
+        """Bitset with the given word indices set."""
+        buf = bytearray((len(self.words) + 7) // 8)
+        for i in ids:
+            buf[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(buf, "little")
+
+    def feedback_mask(self, guess, feedback):
+        """Bitset of every word that would give `feedback` for `guess`."""
+        mask = self.full
+        counted = {}   # letter -> copies confirmed by green/yellow tiles
+        capped = set() # letters with a gray tile: their count is exact
+        for pos, (ch, status) in enumerate(zip(guess, feedback)):
+            c = ord(ch) - 97
+            if status == 2:
+                mask &= self.at[pos][c]
+                counted[c] = counted.get(c, 0) + 1
+            else:
+                # A yellow or gray tile means the letter is not at this position
+                mask &= ~self.at[pos][c]
+                if status == 1:
+                    counted[c] = counted.get(c, 0) + 1
+                else:
+                    capped.add(c)
+        for c, k in counted.items():
+            mask &= self.min_count[c][k]
+        for c in capped:
+            k = counted.get(c, 0)
+            mask &= ~self.min_count[c][k + 1]
+        return mask
+
+    def filter(self, bits, guess, feedback):
+        return bits & self.feedback_mask(guess, feedback)
+
+    @staticmethod
+    def ids_for(bits):
+        """Indices of the set bits, in increasing order."""
+        return [i for i, b in enumerate(reversed(bin(bits)[2:])) if b == "1"]
+
+    def words_for(self, bits):
+        return self.words.words_for(self.ids_for(bits))
+
+    @staticmethod
+    def count(bits):
+        return bin(bits).count("1")
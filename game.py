@@ -1,20 +1,63 @@
 # game.py
 import random
-import collections
+import instrument
+from config import Config
+from patterns import compute_feedback, decode_pattern, encode_feedback, HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+ORDINALS = {1: "st", 2: "nd", 3: "rd"}
+
+
+def hard_mode_violation(guess, history):
+    """
+    Why `guess` breaks the hard-mode rule after `history` ((guess, feedback)
+    pairs), or None if it is allowed: every green letter must stay in place
+    and every revealed letter must be used again.
+    """
+    for past, feedback in history:
+        for pos, (ch, status) in enumerate(zip(past, feedback)):
+            if status == 2 and guess[pos] != ch:
+                return f"{pos + 1}{ORDINALS.get(pos + 1, 'th')} letter must be {ch.upper()}"
+        revealed = {}
+        for ch, status in zip(past, feedback):
+            if status:
+                revealed[ch] = revealed.get(ch, 0) + 1
+        for ch, k in revealed.items():
+            if guess.count(ch) < k:
+                return f"Guess must contain {ch.upper()}" + (f" {k} times" if k > 1 else "")
+    return None
+
 
 class WordleGame:
-    def __init__(self, word_list):
+    def __init__(self, word_list, pattern_table=None, constraint_index=None, hard_mode=Config.HARD_MODE,
+                 guess_list=None):
+        # Secrets are drawn from word_list; any word of guess_list may be
+        # guessed (by default the pattern table's guesses, else word_list)
         self.full_dictionary = word_list
+        if guess_list is None:
+            guess_list = pattern_table.guesses if pattern_table is not None else word_list
+        self.allowed_guesses = guess_list
+        self.word_length = getattr(word_list, "word_length", None) or (len(word_list[0]) if word_list
+                                                                        else Config.WORD_LENGTH)
+        # Optional precomputed feedback matrix (see patterns.PatternTable)
+        self.pattern_table = pattern_table
+        # Optional letter-constraint bitsets (see constraints.ConstraintIndex)
+        self.constraint_index = constraint_index
+        # Hard mode: revealed hints must be used (see hard_mode_violation);
+        # solvers then restrict their guess pools to match
+        self.hard_mode = hard_mode
         self.secret_word = ""
         self.game_over = False
         self.reset_game()
 
-    def reset_game(self):
-        self.secret_word = random.choice(self.full_dictionary)
+    def reset_game(self, secret=None):
+        self.secret_word = secret if secret is not None else random.choice(self.full_dictionary)
         self.game_over = False
 
     def is_valid_word(self, word):
-        return word in self.full_dictionary
+        return len(word) == self.word_length and word in self.allowed_guesses
 
     def check_guess(self, guess):
         """
@@ -23,21 +66,69 @@ class WordleGame:
         1 = Yellow (Present)
         0 = Gray (Absent)
         """
-        guess = guess.lower()
-        target = list(self.secret_word)
-        result = [0] * 5
-        target_counts = collections.Counter(target)
-        
-        # 1. Green Pass
-        for i in range(5):
-            if guess[i] == target[i]:
-                result[i] = 2
-                target_counts[guess[i]] -= 1
-                
-        # 2. Yellow Pass
-        for i in range(5):
-            if result[i] == 0: 
-                if guess[i] in target_counts and target_counts[guess[i]] > 0:
-                    result[i] = 1
-                    target_counts[guess[i]] -= 1
-        return result
\ No newline at end of file
+        profiler = instrument.active
+        if profiler is None:
+            return self._check_guess(guess.lower())
+        start = profiler.start()
+        feedback = self._check_guess(guess.lower())
+        profiler.stop("check_guess", start)
+        return feedback
+
+    def _check_guess(self, guess):
+        if self.pattern_table is not None:
+            code = self.pattern_table.pattern(guess, self.secret_word)
+            if code is not None:
+                if instrument.active is not None: instrument.active.count("table_hit")
+                return decode_pattern(code, len(guess))
+            if instrument.active is not None: instrument.active.count("table_miss")
+        return compute_feedback(guess, self.secret_word)
+
+
+class AdversarialGame(WordleGame):
+    """
+    Absurdle-style game: no secret is fixed up front. The game keeps every
+    answer still consistent with the feedback given so far and answers each
+    guess with the pattern shared by the most of them. Ties go to the lowest
+    pattern code (the most grays), so the all-green pattern is only given
+    once it is the last bucket left.
+
+    `secret_word` is always one of the survivors; checking a guess that was
+    already played returns its feedback again and narrows nothing.
+    """
+    def reset_game(self, secret=None):
+        # The adversary commits to nothing, so `secret` is ignored
+        if self.pattern_table is not None:
+            self.remaining = self.pattern_table.all_answer_ids()
+        else:
+            self.remaining = list(self.full_dictionary)
+        self.secret_word = self.survivors(1)[0]
+        self.game_over = False
+
+    def survivors(self, limit=None):
+        """Answers still consistent with every feedback given (the first `limit` of them)."""
+        ids = self.remaining if limit is None else self.remaining[:limit]
+        return self.pattern_table.words_for(ids) if self.pattern_table is not None else list(ids)
+
+    def survivor_count(self):
+        return len(self.remaining)
+
+    def _check_guess(self, guess):
+        row = self.pattern_table.row(guess) if self.pattern_table is not None else None
+        if row is not None:
+            # One gather and one bincount over the survivors
+            if instrument.active is not None: instrument.active.count("feedback_evals", len(self.remaining))
+            codes = row[self.remaining]
+            code = int(np.argmax(np.bincount(codes)))
+            self.remaining = self.remaining[codes == code]
+        else:
+            # No table, or a guess outside it: the survivors may be ids
+            buckets = {}
+            for i, word in enumerate(self.survivors()):
+                buckets.setdefault(encode_feedback(compute_feedback(guess, word)), []).append(i)
+            code = min(buckets, key=lambda c: (-len(buckets[c]), c))
+            if self.pattern_table is not None:
+                self.remaining = self.remaining[np.asarray(buckets[code], dtype=np.intp)]
+            else:
+                self.remaining = [self.remaining[i] for i in buckets[code]]
+        self.secret_word = self.survivors(1)[0]
+        return decode_pattern(code, len(guess))
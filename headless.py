@@ -0,0 +1,109 @@
+# headless.py
+"""
+Batch solving without Tk.
+
+    python headless.py --solver Entropy < secrets.txt > results.jsonl
+    python headless.py --solver BFS --all --format tsv
+    python headless.py --solver Entropy --all --length 6 --hard
+
+Secrets are streamed (one per line, from a file or stdin) and every game is
+played to completion; one result line is written per game as it finishes.
+"""
+import sys
+import json
+import time
+import argparse
+from config import Config
+from benchmark import play_game
+from constraints import ConstraintIndex
+from game import WordleGame
+from opening_book import OpeningBook
+from patterns import PatternTable, HAS_NUMPY
+from solvers import SOLVER_REGISTRY
+from utils import load_words, load_guesses
+
+
+def solve_many(secrets, solver_class, word_list=None, pattern_table=None, use_book=True, hard_mode=Config.HARD_MODE,
+               guess_list=None):
+    """
+    Plays one game per secret and yields a result dict per game, lazily.
+
+    With word_list=None the default dictionary, its allowed guesses and
+    their cached pattern table are loaded. A single game and solver are reused (reset is O(1)), so the
+    per-game cost is just the solver's own work.
+    """
+    if word_list is None:
+        word_list = load_words()
+        guess_list = load_guesses(word_list)
+        if HAS_NUMPY: pattern_table = PatternTable.load(word_list, guess_list)
+    index = ConstraintIndex(word_list) if pattern_table is None else None
+    game = WordleGame(word_list, pattern_table, index, hard_mode, guess_list)
+    solver = solver_class(game)
+    solver.opening_book = OpeningBook.load(solver_class, word_list, hard_mode=hard_mode,
+                                           guess_list=game.allowed_guesses) if use_book else None
+
+    for secret in secrets:
+        secret = secret.strip().lower()
+        if not secret:
+            continue
+        if secret not in word_list:
+            yield {"secret": secret, "error": "not in word list"}
+            continue
+        game.reset_game(secret)
+        rec = play_game(game, solver)
+        yield {"secret": secret, "won": rec["won"], "guesses": rec["guesses"],
+               "path": rec["path"], "latency_us": round(rec["time"], 1)}
+
+
+def format_result(result, fmt):
+    if fmt == "jsonl":
+        return json.dumps(result)
+    if "error" in result:
+        return f"{result['secret']}\terror\t{result['error']}"
+    return "\t".join([result["secret"], "won" if result["won"] else "lost", str(result["guesses"]),
+                      ",".join(result["path"]), str(result["latency_us"])])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve many Wordle games headlessly.")
+    parser.add_argument("--solver", default="Entropy", choices=list(SOLVER_REGISTRY))
+    parser.add_argument("--secrets", default="-", help="file with one secret per line ('-' for stdin)")
+    parser.add_argument("--all", action="store_true", help="use every word of the list as a secret")
+    parser.add_argument("--words", default=None, help="word list file (default: the list for --length)")
+    parser.add_argument("--guesses", default=None, help="allowed-guess list (default: the list for --length)")
+    parser.add_argument("--length", type=int, default=Config.WORD_LENGTH, help="word length")
+    parser.add_argument("--hard", action="store_true", help="play in hard mode")
+    parser.add_argument("--format", default="jsonl", choices=["jsonl", "tsv"])
+    parser.add_argument("--no-book", action="store_true", help="ignore prebuilt opening books")
+    args = parser.parse_args()
+
+    words = load_words(args.words, args.length)
+    guesses = load_guesses(words, args.guesses)
+    table = PatternTable.load(words, guesses) if HAS_NUMPY else None
+    solver_class = SOLVER_REGISTRY[args.solver]
+    if solver_class.REQUIRES_TABLE and table is None:
+        sys.exit(f"{args.solver} needs numpy")
+
+    if args.all:
+        source = iter(words)
+    elif args.secrets == "-":
+        source = sys.stdin
+    else:
+        source = open(args.secrets, "r")
+
+    games = wins = skipped = 0
+    start = time.perf_counter()
+    out = sys.stdout
+    for result in solve_many(source, solver_class, words, table, use_book=not args.no_book, hard_mode=args.hard,
+                             guess_list=guesses):
+        out.write(format_result(result, args.format) + "\n")
+        if "error" in result:
+            skipped += 1
+            continue
+        games += 1
+        wins += result["won"]
+    elapsed = time.perf_counter() - start
+    if source is not sys.stdin and hasattr(source, "close"):
+        source.close()
+    print(f"{games} games, {wins} won, {skipped} skipped, {games / elapsed if elapsed else 0:.0f} games/s",
+          file=sys.stderr)
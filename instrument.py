@@ -0,0 +1,167 @@
+# instrument.py
+"""
+Opt-in hot-path instrumentation.
+
+The solvers, the pattern table and the game report counters and phase
+timings through the module-level `active`. It is None unless a Profiler
+is enabled in some thread, and every instrumented site starts with one
+`instrument.active is not None` check, so a run without profiling pays a
+global lookup per call and nothing more.
+
+Profilers are per thread: while any thread profiles, `active` forwards
+each count and phase to the calling thread's own profiler, or drops it if
+that thread has none. A profiled benchmark run therefore never picks up
+(or races with) the work of other threads in the process, such as the
+GUI's solver and analysis workers.
+
+    with Profiler(trace=True) as profiler:
+        bench.run()
+    print("\\n".join(format_summary(profiler.summary())))
+    profiler.write_trace("trace.json")  # open in chrome://tracing or Perfetto
+
+Counters:
+    candidates_scanned   candidates tested by filter_candidates
+    feedback_evals       feedback patterns computed or looked up
+    guesses_scored       guesses scored by the probing solvers
+    table_hit/_miss      check_guess answered from the pattern table or not
+    book_hit/_miss       solve_step answered from the opening book or not
+    tt_hit/_miss         Lookahead/Minimax transposition table lookups
+"""
+import os
+import json
+import time
+import threading
+import collections
+from aggregators import RunningStats
+
+active = None  # _ThreadDispatch while any thread has a profiler enabled, else None
+
+
+class _State(threading.local):
+    profiler = None  # the calling thread's enabled Profiler
+
+
+state = _State()
+_lock = threading.Lock()
+_profiling = 0  # threads with a profiler enabled
+
+
+class Profiler:
+    """Counters, per-phase wall time (µs) and, optionally, a Chrome trace."""
+    TRACE_LIMIT = 200_000  # trace events kept; later phases are still timed, not traced
+
+    def __init__(self, trace=False):
+        self.counters = collections.Counter()
+        self.phases = collections.defaultdict(RunningStats)
+        self.events = [] if trace else None
+        self.dropped = 0
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    @staticmethod
+    def start():
+        return time.perf_counter()
+
+    def stop(self, name, start):
+        """Ends the phase `name` begun at `start` (a start() value)."""
+        end = time.perf_counter()
+        self.phases[name].add((end - start) * 1_000_000)
+        if self.events is not None:
+            if len(self.events) < self.TRACE_LIMIT:
+                self.events.append((name, start, end, os.getpid(), threading.get_ident()))
+            else:
+                self.dropped += 1
+
+    def merge(self, other):
+        """Adds another profiler's results (e.g. from a worker process)."""
+        self.counters.update(other.counters)
+        for name, stats in other.phases.items():
+            self.phases[name].merge(stats)
+        if self.events is not None and other.events is not None:
+            room = self.TRACE_LIMIT - len(self.events)
+            self.events.extend(other.events[:room])
+            self.dropped += other.dropped + max(0, len(other.events) - room)
+
+    def summary(self):
+        """Plain dict (JSON-ready) of the counters and per-phase time."""
+        return {
+            "counters": dict(self.counters),
+            "phases": {name: {"calls": s.count, "total_ms": s.mean * s.count / 1000, "mean_us": s.mean,
+                              "max_us": s.max}
+                       for name, s in sorted(self.phases.items()) if s.count},
+        }
+
+    def chrome_trace(self):
+        """Trace-event JSON object: one complete ("X") event per timed phase."""
+        events = [{"name": name, "cat": "wordle", "ph": "X", "ts": start * 1_000_000,
+                   "dur": (end - start) * 1_000_000, "pid": pid, "tid": tid}
+                  for name, start, end, pid, tid in self.events or ()]
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"counters": dict(self.counters), "dropped_events": self.dropped}}
+
+    def write_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    # --- Enabling ---
+    def __enter__(self):
+        self._previous = enable(self)
+        return self
+
+    def __exit__(self, *exc):
+        _set(self._previous)
+
+
+class _ThreadDispatch:
+    """`active` while profiling: forwards to the calling thread's profiler, if it has one."""
+    start = staticmethod(time.perf_counter)
+
+    @staticmethod
+    def count(name, n=1):
+        profiler = state.profiler
+        if profiler is not None:
+            profiler.count(name, n)
+
+    @staticmethod
+    def stop(name, start):
+        profiler = state.profiler
+        if profiler is not None:
+            profiler.stop(name, start)
+
+
+def _set(profiler):
+    """Sets the calling thread's profiler; returns the previous one."""
+    global active, _profiling
+    previous, state.profiler = state.profiler, profiler
+    with _lock:
+        _profiling += (profiler is not None) - (previous is not None)
+        active = _ThreadDispatch if _profiling else None
+    return previous
+
+
+def enable(profiler=None):
+    """Makes `profiler` (default: a new one) the calling thread's profiler; returns the previous one."""
+    return _set(profiler if profiler is not None else Profiler())
+
+
+def disable():
+    """Stops profiling in the calling thread; returns the profiler that was enabled."""
+    return _set(None)
+
+
+def format_summary(summary):
+    """Summary dict as text lines: phases by total time, then counters."""
+    lines = [f"{'phase':<18} {'calls':>9} {'total ms':>10} {'mean µs':>10} {'max µs':>10}"]
+    for name, p in sorted(summary["phases"].items(), key=lambda item: -item[1]["total_ms"]):
+        lines.append(f"{name:<18} {p['calls']:>9} {p['total_ms']:>10.1f} {p['mean_us']:>10.1f} {p['max_us']:>10.1f}")
+    counters = summary["counters"]
+    for name in sorted(counters):
+        lines.append(f"{name:<18} {counters[name]:>9}")
+    for hit, miss, label in (("table_hit", "table_miss", "pattern table"), ("book_hit", "book_miss", "opening book"),
+                             ("tt_hit", "tt_miss", "transpositions")):
+        lookups = counters.get(hit, 0) + counters.get(miss, 0)
+        if lookups:
+            lines.append(f"{label} hit rate: {100 * counters.get(hit, 0) / lookups:.1f}%")
+    return lines
@@ -0,0 +1,107 @@
+# loadgen.py
+"""
+Load generator for server.py.
+
+    python loadgen.py --clients 32 --games 500 --solver Entropy
+
+Each client keeps one connection open and plays whole bot games through
+it (new, then step until the game is over, then close) until `--games`
+have been played in total. Every request's round-trip latency goes into
+streaming aggregators; the report gives requests/s and p50/p95/p99/max
+latency, overall and per op.
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+import collections
+from aggregators import RunningStats, TDigest
+from config import Config
+from utils import load_words
+
+
+class Client:
+    """One connection; requests are sent one at a time, as the protocol answers in order."""
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+        self.next_id = 0
+
+    async def call(self, op, **fields):
+        self.next_id += 1
+        start = time.perf_counter()
+        self.writer.write(json.dumps(dict(fields, op=op, id=self.next_id)).encode() + b"\n")
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for key in (op, "all"):
+            stats, digest = self.latencies[key]
+            stats.add(elapsed_ms)
+            digest.add(elapsed_ms)
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(f"{op}: {reply.get('error')}")
+        return reply
+
+
+async def run_client(host, port, secrets, options, budget_ms, latencies, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    client = Client(reader, writer, latencies)
+    try:
+        while secrets:
+            secret = secrets.pop()
+            session = (await client.call("new", secret=secret, **options))["session"]
+            reply = {"over": False}
+            while not reply["over"]:
+                reply = await client.call("step", session=session, budget_ms=budget_ms)
+            await client.call("close", session=session)
+            results.append((reply["won"], reply["attempts"]))
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, secrets, options, budget_ms=Config.SERVER_STEP_BUDGET_MS):
+    latencies = collections.defaultdict(lambda: (RunningStats(), TDigest()))
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, secrets, options, budget_ms, latencies, results) for _ in range(clients)))
+    return time.perf_counter() - start, latencies, results
+
+
+def print_report(elapsed, latencies, results):
+    requests = latencies["all"][0].count
+    wins = sum(won for won, _ in results)
+    print(f"{len(results)} games ({wins} won, {sum(a for _, a in results) / max(len(results), 1):.2f} guesses avg) "
+          f"in {elapsed:.2f}s: {requests / elapsed:.0f} req/s, {len(results) / elapsed:.1f} games/s")
+    print(f"{'op':<8} {'count':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+    for op in ["all"] + sorted(k for k in latencies if k != "all"):
+        stats, digest = latencies[op]
+        print(f"{op:<8} {stats.count:>7} {stats.mean:>8.2f} {digest.quantile(0.5):>8.2f} "
+              f"{digest.quantile(0.95):>8.2f} {digest.quantile(0.99):>8.2f} {stats.max:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play many concurrent bot games against server.py.")
+    parser.add_argument("--host", default=Config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent connections")
+    parser.add_argument("--games", type=int, default=200, help="games played in total")
+    parser.add_argument("--solver", default="Entropy")
+    parser.add_argument("--length", type=int, default=Config.WORD_LENGTH, help="word length")
+    parser.add_argument("--hard", action="store_true", help="play in hard mode")
+    parser.add_argument("--budget-ms", type=float, default=Config.SERVER_STEP_BUDGET_MS, help="time budget per step")
+    parser.add_argument("--words", default=None, help="word list the secrets are drawn from (must match the server's)")
+    parser.add_argument("--seed", type=int, default=Config.BENCHMARK_SEED, help="seed for the secret sample")
+    args = parser.parse_args()
+
+    words = load_words(args.words, args.length)
+    rng = random.Random(args.seed)
+    secrets = [rng.choice(words) for _ in range(args.games)]
+    options = {"solver": args.solver, "length": args.length, "hard": args.hard}
+    elapsed, latencies, results = asyncio.run(run_load(args.host, args.port, args.clients, secrets, options,
+                                                                 args.budget_ms))
+    print_report(elapsed, latencies, results)
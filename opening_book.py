@@ -0,0 +1,139 @@
+# opening_book.py
+import os
+import json
+import argparse
+from config import Config
+from game import WordleGame
+from patterns import PatternTable, HAS_NUMPY, compute_feedback, encode_feedback, decode_pattern
+from solvers import SOLVER_REGISTRY
+from constraints import ConstraintIndex
+from utils import load_words, load_guesses, pools_hash
+
+
+class OpeningBook:
+    """
+    Precomputed early moves of one solver.
+
+    Maps a game history (the (guess, feedback code) pairs played so far) to
+    the guess the solver would search its way to, for the first `depth`
+    turns. Books are searched without a time budget and solvers are
+    deterministic, so replaying the book gives exactly
+    the same games while skipping the expensive full-dictionary searches.
+    Hard mode restricts the guesses after the first turn, so it has books
+    of its own; a separate allowed-guess list is part of the book's key.
+    """
+    VERSION = 1
+
+    def __init__(self, solver_name, words_hash, depth, moves, hard_mode=False):
+        self.solver_name = solver_name
+        self.words_hash = words_hash
+        self.depth = depth
+        self.moves = moves
+        self.hard_mode = hard_mode
+
+    @staticmethod
+    def history_key(history):
+        return "/".join(f"{guess}:{code}" for guess, code in history)
+
+    def lookup(self, history):
+        """Book move for this history, or None once the game leaves the book."""
+        if len(history) >= self.depth:
+            return None
+        return self.moves.get(self.history_key(history))
+
+    # --- Building ---
+    @classmethod
+    def build(cls, solver_class, word_list, pattern_table=None, depth=Config.BOOK_DEPTH, progress_callback=None,
+              hard_mode=False):
+        """Expands every feedback branch of the solver's first `depth` turns."""
+        game = WordleGame(word_list, pattern_table, ConstraintIndex(word_list) if pattern_table is None else None,
+                          hard_mode=hard_mode)
+        moves = {}
+
+        def expand(path):
+            solver = solver_class(game)
+            if getattr(solver, "budget_ms", None) is not None:
+                solver.budget_ms = None  # a cut-short search would make the book depend on machine speed
+            solver.reset()
+            for guess, code in path:
+                solver.filter_candidates(guess, decode_pattern(code, len(guess)))
+            guess = solver.choose_guess()
+            if guess is None:
+                return
+            moves[cls.history_key(path)] = guess
+            if progress_callback: progress_callback(len(moves))
+            if len(path) + 1 >= depth:
+                return
+            for code in cls.branch_codes(solver, guess):
+                expand(path + [(guess, code)])
+
+        expand([])
+        guess_list = pattern_table.guesses if pattern_table is not None else None
+        return cls(solver_class.__name__, pools_hash(word_list, guess_list), depth, moves, hard_mode)
+
+    @staticmethod
+    def branch_codes(solver, guess):
+        """Feedback codes `guess` can still receive, excluding the win."""
+        row = solver.table.row(guess) if solver.candidate_ids is not None else None
+        if row is not None:
+            codes = set(row[solver.candidate_ids].tolist())
+        else:
+            codes = {encode_feedback(compute_feedback(guess, w)) for w in solver.candidates}
+        codes.discard(3 ** len(guess) - 1)
+        return sorted(codes)
+
+    # --- Storage (next to Config.WORDS_FILE) ---
+    @staticmethod
+    def path(solver_name, word_list, hard_mode=False, guess_list=None):
+        """
+        Keyed by word length and the hash of the word lists, never by the
+        file they came from, so every loader finds the book of the lists it
+        was given (per-length lists and --words files included).
+        """
+        base = os.path.splitext(Config.WORDS_FILE)[0]
+        mode = ".hard" if hard_mode else ""
+        length = len(word_list[0]) if word_list else Config.WORD_LENGTH
+        return f"{base}.{solver_name}{mode}.L{length}.{pools_hash(word_list, guess_list)}.book.json"
+
+    def save(self, word_list, guess_list=None):
+        path = self.path(self.solver_name, word_list, self.hard_mode, guess_list)
+        with open(path, "w") as f:
+            json.dump({"version": self.VERSION, "solver": self.solver_name, "words_hash": self.words_hash,
+                       "hard_mode": self.hard_mode, "depth": self.depth, "moves": self.moves}, f)
+        return path
+
+    @classmethod
+    def load(cls, solver_class, word_list, hard_mode=False, guess_list=None):
+        """Book for this solver, word lists and mode, or None if none has been built."""
+        path = cls.path(solver_class.__name__, word_list, hard_mode, guess_list)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != cls.VERSION or data.get("words_hash") != pools_hash(word_list, guess_list):
+            return None
+        return cls(data["solver"], data["words_hash"], data["depth"], data["moves"], data.get("hard_mode", False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build opening books for the Wordle solvers.")
+    parser.add_argument("solvers", nargs="*", default=list(SOLVER_REGISTRY),
+                        help="solver names (default: all)")
+    parser.add_argument("--depth", type=int, default=Config.BOOK_DEPTH, help="turns covered by the book")
+    parser.add_argument("--words", default=None, help="word list file (default: the list for --length)")
+    parser.add_argument("--guesses", default=None, help="allowed-guess list (default: the list for --length)")
+    parser.add_argument("--length", type=int, default=Config.WORD_LENGTH, help="word length")
+    parser.add_argument("--hard", action="store_true", help="build hard-mode books")
+    args = parser.parse_args()
+
+    words = load_words(args.words, args.length)
+    guesses = load_guesses(words, args.guesses)
+    table = PatternTable.load(words, guesses) if HAS_NUMPY else None
+    for name in args.solvers:
+        solver_class = SOLVER_REGISTRY[name]
+        if solver_class.REQUIRES_TABLE and table is None:
+            print(f"{name}: skipped (needs numpy)")
+            continue
+        book = OpeningBook.build(solver_class, words, table, depth=args.depth, hard_mode=args.hard)
+        print(f"{name}: {len(book.moves)} positions -> {book.save(words, guesses)}")
@@ -0,0 +1,361 @@
+# patterns.py
+import os
+import glob
+import contextlib
+import instrument
+from config import Config
+from utils import word_list_hash
+from wordbank import WordBank
+
+# Numpy Check
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def compute_feedback(guess, answer):
+    """
+    Returns the Wordle feedback for `guess` against `answer`:
+    2 = Green (Correct)
+    1 = Yellow (Present)
+    0 = Gray (Absent)
+    """
+    if instrument.active is not None:
+        instrument.active.count("feedback_evals")
+    length = len(guess)
+    result = [0] * length
+    remaining = {}
+
+    # 1. Green Pass
+    for i in range(length):
+        if guess[i] == answer[i]:
+            result[i] = 2
+        else:
+            remaining[answer[i]] = remaining.get(answer[i], 0) + 1
+
+    # 2. Yellow Pass
+    for i in range(length):
+        if result[i] == 0 and remaining.get(guess[i], 0) > 0:
+            result[i] = 1
+            remaining[guess[i]] -= 1
+    return result
+
+
+def encode_feedback(feedback):
+    """Packs a feedback list into a base-3 integer (tile i has weight 3**i)."""
+    code = 0
+    for status in reversed(feedback):
+        code = code * 3 + status
+    return code
+
+
+def decode_pattern(code, length=Config.WORD_LENGTH):
+    """Inverse of encode_feedback."""
+    feedback = []
+    for _ in range(length):
+        code, status = divmod(code, 3)
+        feedback.append(status)
+    return feedback
+
+
+def winning_pattern(length=Config.WORD_LENGTH):
+    """Pattern code of an all-green row."""
+    return 3 ** length - 1
+
+
+def pattern_dtype(length=Config.WORD_LENGTH):
+    """Smallest unsigned dtype holding every pattern code of a word length (3**L codes)."""
+    if 3 ** length <= 2 ** 8:
+        return np.uint8
+    return np.uint16 if 3 ** length <= 2 ** 16 else np.uint32
+
+
+def hard_mode_mask(letters, guess, feedback):
+    """
+    Rows of `letters` ((N, L) letter codes, see WordBank.letters) that are
+    still allowed guesses in hard mode after `guess` got `feedback`: every
+    green letter stays in place and every revealed letter is used at least
+    as many times as it was revealed.
+    """
+    mask = np.ones(len(letters), dtype=bool)
+    revealed = {}
+    for pos, (ch, status) in enumerate(zip(guess, feedback)):
+        c = ord(ch) - 97
+        if status == 2:
+            mask &= letters[:, pos] == c
+        if status:
+            revealed[c] = revealed.get(c, 0) + 1
+    for c, k in revealed.items():
+        mask &= (letters == c).sum(axis=1) >= k
+    return mask
+
+
+class PatternTable:
+    """
+    Precomputed guess x answer feedback matrix.
+
+    Cell [g, a] holds the encoded feedback (0 to 3**L - 1, e.g. 0-242 for
+    5 letters) of guess number g against answer number a, so game checks
+    and candidate filtering become a lookup plus a boolean mask over answer
+    indices.
+    """
+    CHUNK_ROWS = 256
+    BUCKET_ROWS = 64
+    BUCKET_CELLS = 1 << 20  # matrix cells (or counts) per bincount block
+
+    def __init__(self, guesses, answers=None, matrix=None):
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for PatternTable")
+        self.guesses = WordBank.of(guesses)
+        self.answers = self.guesses if answers is None else WordBank.of(answers)
+        self.word_length = self.answers.word_length
+        self.win_code = winning_pattern(self.word_length)
+        # Guess row of every answer (-1 when an answer is not a valid guess)
+        if self.answers is self.guesses:
+            self.answer_guess_ids = self.answers.all_ids()
+        else:
+            self.answer_guess_ids = np.array([-1 if g is None else g for g in map(self.guesses.index_of, self.answers)],
+                                             dtype=np.int32)
+        if matrix is None:
+            matrix = np.empty((len(self.guesses), len(self.answers)), dtype=pattern_dtype(self.word_length))
+            self.fill_rows(matrix, self.guesses, self.answers)
+        self.matrix = matrix
+
+    @staticmethod
+    def encode_words(words):
+        """Words as an (N, L) uint8 array of letter codes."""
+        if isinstance(words, WordBank):
+            return words.letters
+        if not words:
+            return np.zeros((0, Config.WORD_LENGTH), dtype=np.uint8)
+        buf = "".join(words).encode("ascii")
+        return np.frombuffer(buf, dtype=np.uint8).reshape(len(words), -1) - ord("a")
+
+    @classmethod
+    def fill_rows(cls, out, guesses, answers):
+        """Computes the matrix of `guesses` x `answers` into `out`, in chunks."""
+        guess_arr = cls.encode_words(guesses)
+        answer_arr = cls.encode_words(answers)
+        # Column-major letters and per-letter counts of every answer
+        answer_cols = np.ascontiguousarray(answer_arr.T)
+        answer_counts = np.zeros((26, len(answers)), dtype=np.int8)
+        for col in answer_cols:
+            np.add.at(answer_counts, (col, np.arange(len(col))), 1)
+        for lo in range(0, len(guess_arr), cls.CHUNK_ROWS):
+            chunk = guess_arr[lo:lo + cls.CHUNK_ROWS]
+            out[lo:lo + len(chunk)] = cls.compute_chunk(chunk, answer_cols, answer_counts)
+
+    @staticmethod
+    def compute_chunk(guess_arr, answer_cols, answer_counts):
+        """
+        Vectorized two-pass feedback for a block of guesses vs all answers.
+
+        Tile i is yellow when it is not green and the answer still has a
+        copy of its letter left, i.e. count(letter) minus the copies used by
+        earlier same-letter tiles minus later same-letter greens is positive.
+        """
+        length = guess_arr.shape[1]
+        dtype = pattern_dtype(length)
+        green = [guess_arr[:, i, None] == answer_cols[i] for i in range(length)]
+        codes = np.zeros(green[0].shape, dtype=dtype)
+        weight = 1
+        for i in range(length):
+            letters = guess_arr[:, i]
+            left = answer_counts[letters]
+            prior = (guess_arr[:, :i] == letters[:, None]).sum(axis=1, dtype=np.int8)
+            left -= prior[:, None]
+            for j in range(i + 1, length):
+                same = guess_arr[:, j] == letters
+                if same.any():
+                    left -= green[j] & same[:, None]
+            yellow = (left > 0) & ~green[i]
+            state = green[i].view(np.uint8) * np.uint8(2) + yellow.view(np.uint8)
+            codes += state.astype(dtype, copy=False) * dtype(weight)
+            weight *= 3
+        return codes
+
+    @classmethod
+    def load(cls, answers, guesses=None, cache_dir=Config.CACHE_DIR):
+        """
+        Opens the table for these word lists from the on-disk cache, building
+        it first if needed. `guesses` may be a subset of the answers (only
+        those rows are computed). The file is memory-mapped read-only, so
+        several processes share one copy through the page cache. If the
+        cache cannot be written, the table is computed in memory instead.
+        """
+        guesses = answers if guesses is None else guesses
+        path = cls.cache_path(answers, guesses, cache_dir)
+        matrix = None
+        if os.path.exists(path):
+            try:
+                matrix = np.load(path, mmap_mode="r")
+                if matrix.shape != (len(guesses), len(answers)):
+                    matrix = None
+                else:
+                    with contextlib.suppress(OSError):
+                        os.utime(path)  # marks the table as recently used for prune_cache
+            except (OSError, ValueError):
+                matrix = None
+        if matrix is None:
+            cls.prune_cache(answers, cache_dir, keep=Config.PATTERN_CACHE_TABLES - 1)
+            try:
+                cls.build_file(path, guesses, answers)
+                matrix = np.load(path, mmap_mode="r")
+            except OSError:
+                # A read-only checkout simply builds the table on every start
+                return cls(guesses, answers)
+        return cls(guesses, answers, matrix=matrix)
+
+    @staticmethod
+    def cache_path(answers, guesses, cache_dir=Config.CACHE_DIR):
+        length = len(answers[0]) if answers else Config.WORD_LENGTH
+        name = f"patterns-L{length}-{word_list_hash(answers)}-{word_list_hash(guesses)}.npy"
+        return os.path.join(cache_dir, name)
+
+    @staticmethod
+    def prune_cache(answers, cache_dir=Config.CACHE_DIR, keep=Config.PATTERN_CACHE_TABLES):
+        """
+        Keeps the `keep` most recently used tables of this word length and
+        removes the rest. A different word-list hash does not make a table
+        stale (several lists of one length may be in use), so the cache is
+        bounded by count rather than by list.
+        """
+        length = len(answers[0]) if answers else Config.WORD_LENGTH
+        tables = []
+        for path in glob.glob(os.path.join(cache_dir, f"patterns-L{length}-*.npy")):
+            with contextlib.suppress(OSError):  # another process may be pruning too
+                tables.append((os.path.getmtime(path), path))
+        for _, path in sorted(tables, reverse=True)[max(keep, 0):]:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+    @classmethod
+    def build_file(cls, path, guesses, answers):
+        """Computes the table straight into a .npy file (atomically replaced)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        length = len(answers[0]) if answers else Config.WORD_LENGTH
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=pattern_dtype(length),
+                                        shape=(len(guesses), len(answers)))
+        try:
+            cls.fill_rows(out, guesses, answers)
+            out.flush()
+            del out
+            os.replace(tmp_path, path)
+        except BaseException:
+            del out
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+    def pattern(self, guess, answer):
+        """Encoded feedback for two words, or None if either is not in the table."""
+        g = self.guesses.index_of(guess)
+        a = self.answers.index_of(answer)
+        if g is None or a is None:
+            return None
+        return int(self.matrix[g, a])
+
+    def row(self, guess):
+        """Pattern codes of `guess` against every answer, or None if unknown."""
+        g = self.guesses.index_of(guess)
+        if g is None:
+            return None
+        return self.matrix[g]
+
+    def all_answer_ids(self):
+        return self.answers.all_ids()
+
+    def filter_ids(self, candidate_ids, guess, code):
+        """Keeps the answer indices whose pattern against `guess` equals `code`."""
+        row = self.row(guess)
+        if row is None:
+            return None
+        if instrument.active is not None:
+            instrument.active.count("feedback_evals", len(candidate_ids))
+        return candidate_ids[row[candidate_ids] == code]
+
+    def bucket_counts(self, candidate_ids, guess_ids=None):
+        """
+        Histogram of pattern codes for each guess over the candidates:
+        row g, column p = how many candidates answer guess g with pattern p.
+        """
+        num_codes = 3 ** self.word_length
+        num_guesses = len(self.guesses) if guess_ids is None else len(guess_ids)
+        counts = np.empty((num_guesses, num_codes), dtype=np.int32)
+        for lo, hi, block in self.iter_bucket_counts(candidate_ids, guess_ids):
+            counts[lo:hi] = block
+        return counts
+
+    def iter_bucket_counts(self, candidate_ids, guess_ids=None):
+        """
+        bucket_counts as (lo, hi, rows lo:hi) blocks, built with one bincount
+        per block of guesses (codes offset per row). Callers that reduce each
+        block keep memory bounded even with 3**8 codes per row.
+
+        Blocks hold about BUCKET_CELLS cells, so a large guess pool scored
+        against a few survivors runs in a handful of bincounts rather than
+        one per BUCKET_ROWS guesses.
+        """
+        num_codes = 3 ** self.word_length
+        for lo, hi, block in self._iter_blocks(candidate_ids, guess_ids, max(len(candidate_ids), num_codes)):
+            flat = (block + (np.arange(hi - lo, dtype=np.intp) * num_codes)[:, None]).ravel()
+            yield lo, hi, np.bincount(flat, minlength=(hi - lo) * num_codes).reshape(hi - lo, num_codes)
+
+    def iter_bucket_sizes(self, candidate_ids, guess_ids=None):
+        """
+        Like iter_bucket_counts, but yields (lo, hi, sizes, wins): `sizes`
+        holds each guess's non-winning bucket sizes in no particular order,
+        zero-padded, and `wins` the size (0 or 1) of its winning bucket.
+        Sums, maxima and counts of non-empty buckets read the same either
+        way.
+
+        While the survivors are few next to the 3**L codes, the rows are
+        sorted and their runs measured instead of histogrammed, so a block
+        is only as wide as the survivor set. A late-game move then costs
+        guesses x survivors, not guesses x 3**L, however long the words.
+        """
+        n = len(candidate_ids)
+        win = self.win_code
+        if n * max(1, n.bit_length()) >= 3 ** self.word_length:
+            for lo, hi, counts in self.iter_bucket_counts(candidate_ids, guess_ids):
+                wins = counts[:, win].copy()
+                counts[:, win] = 0
+                yield lo, hi, counts, wins
+            return
+        pos = np.arange(n)
+        for lo, hi, block in self._iter_blocks(candidate_ids, guess_ids, n):
+            rows = np.sort(block, axis=1)
+            ends = np.ones(rows.shape, dtype=bool)
+            ends[:, :-1] = rows[:, 1:] != rows[:, :-1]
+            starts = np.ones(rows.shape, dtype=bool)
+            starts[:, 1:] = ends[:, :-1]
+            run_start = np.maximum.accumulate(np.where(starts, pos, 0), axis=1)
+            # Each run's length sits at its last cell; the win code sorts last
+            sizes = np.where(ends & (rows != win), pos - run_start + 1, 0)
+            yield lo, hi, sizes, (rows[:, -1] == win).astype(np.int64)
+
+    def _iter_blocks(self, candidate_ids, guess_ids, width):
+        """(lo, hi, patterns of guesses lo:hi against the candidates), about BUCKET_CELLS / width rows each."""
+        full = len(candidate_ids) == len(self.answers)
+        rows = self.matrix if guess_ids is None else None
+        num_guesses = len(self.guesses) if guess_ids is None else len(guess_ids)
+        step = max(self.BUCKET_ROWS, self.BUCKET_CELLS // max(width, 1))
+        step = min(step, max(num_guesses, 1))
+        for lo in range(0, num_guesses, step):
+            hi = min(lo + step, num_guesses)
+            if instrument.active is not None:
+                instrument.active.count("feedback_evals", (hi - lo) * len(candidate_ids))
+            if rows is not None:
+                block = rows[lo:hi] if full else rows[lo:hi, candidate_ids]
+            elif full:
+                block = self.matrix[guess_ids[lo:hi]]
+            else:
+                # Picks the cells directly, never copying the whole rows first
+                block = self.matrix[np.ix_(guess_ids[lo:hi], candidate_ids)]
+            yield lo, hi, block
+
+    def words_for(self, candidate_ids):
+        return self.answers.words_for(candidate_ids)
@@ -0,0 +1,338 @@
+# server.py
+"""
+Many Wordle sessions, human or bot, served from one process.
+
+    python server.py --port 8765
+    python loadgen.py --clients 32 --games 500
+
+The protocol is line-delimited JSON over TCP: one request object per line,
+one response per line, in order. Every request has an "op" and may carry
+an "id", which is echoed back. Responses have "ok" and either the result
+fields or an "error" message.
+
+    {"op": "new", "solver": "Entropy", "length": 5, "hard": false}
+        -> {"session": "...", "length": 5, "max_attempts": 6, "candidates": N}
+    {"op": "guess", "session": "...", "word": "crane"}
+        -> {"feedback": [0, 2, ...], "won": ..., "over": ..., "attempts": ..., "candidates": N}
+    {"op": "suggest", "session": "...", "budget_ms": 300}
+        -> {"guess": "...", "report": {...}, "candidates": N}
+    {"op": "step", "session": "..."}       suggest, then play the suggestion
+    {"op": "state", "session": "..."}      the session without playing
+    {"op": "close", "session": "..."}
+    {"op": "stats"}
+
+"new" also takes "secret" (for reproducible bot games), or "adversarial":
+true for an Absurdle-style game (see game.AdversarialGame) that fixes no
+secret. The secret is only revealed once the game is over.
+
+Word lists, pattern tables and opening books are loaded once per word
+length and shared read-only by every session; each session owns only its
+game and solver state. Filtering and solve steps run on a thread pool, so
+a long search never stalls the event loop. Sessions idle for
+SERVER_SESSION_TTL_S are evicted, and the least recently used one makes
+room once SERVER_MAX_SESSIONS are open.
+"""
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from benchmark import MAX_ATTEMPTS
+from constraints import ConstraintIndex
+from game import WordleGame, AdversarialGame, hard_mode_violation
+from opening_book import OpeningBook
+from patterns import PatternTable, HAS_NUMPY
+from solvers import SOLVER_REGISTRY, probe_order
+from utils import load_words, load_guesses
+
+
+class RequestError(Exception):
+    """A request the service rejects; its message goes back to the client."""
+
+
+class SharedTables:
+    """Word lists, pattern tables and opening books, loaded once per length."""
+    def __init__(self, words_file=None, guesses_file=None):
+        self.words_file = words_file
+        self.guesses_file = guesses_file
+        self.pools = {}  # length -> (word list, guess list, pattern table, constraint index)
+        self.books = {}  # (solver class, length, hard mode) -> OpeningBook or None
+        # (solver class, length, hard mode) -> transposition table shared by
+        # every session of that kind, each bounded by the solver's TABLE_LIMIT
+        self.transpositions = {}
+
+    def load(self, length):
+        if length not in self.pools:
+            words = load_words(self.words_file, length)
+            if not words:
+                raise RequestError(f"no {length}-letter words")
+            guesses = load_guesses(words, self.guesses_file)
+            table = PatternTable.load(words, guesses) if HAS_NUMPY else None
+            index = ConstraintIndex(words) if table is None else None
+            if table is not None:
+                probe_order(table)  # ranked once here, so new sessions start in microseconds
+            self.pools[length] = (words, guesses, table, index)
+        return self.pools[length]
+
+    def book(self, solver_class, length, hard_mode):
+        key = (solver_class, length, hard_mode)
+        if key not in self.books:
+            words, guesses = self.load(length)[:2]
+            self.books[key] = OpeningBook.load(solver_class, words, hard_mode, guesses)
+        return self.books[key]
+
+    def make_solver(self, solver_class, game):
+        """A solver for `game` with its book and shared search state attached (executor thread)."""
+        key = (solver_class, game.word_length, game.hard_mode)
+        solver = solver_class(game)
+        solver.opening_book = self.books[key]
+        if hasattr(solver, "transpositions"):
+            # Entries are keyed by candidate set (and hard-mode pool), so
+            # sessions of one kind can share them; one table per kind keeps
+            # the service's memory independent of the number of sessions
+            solver.transpositions = self.transpositions.setdefault(key, solver.transpositions)
+        solver.reset()
+        return solver
+
+
+class Session:
+    """One game and its solver. Operations on a session are serialized by its lock."""
+    def __init__(self, session_id, game, solver):
+        self.id = session_id
+        self.game = game
+        self.solver = solver
+        self.history = []  # (guess, feedback) pairs played
+        self.won = False
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    @property
+    def over(self):
+        return self.won or len(self.history) >= MAX_ATTEMPTS
+
+    def play(self, guess):
+        """Checks `guess` and filters the solver's candidates (executor thread)."""
+        feedback = self.game.check_guess(guess)
+        self.solver.filter_candidates(guess, feedback)
+        self.history.append((guess, feedback))
+        self.won = all(f == 2 for f in feedback)
+        self.game.game_over = self.over
+        return feedback
+
+    def suggest(self, deadline):
+        """Next solver guess by `deadline`, a time.perf_counter() value (executor thread)."""
+        count = self.solver.candidate_count()
+        guess = self.solver.solve_step(deadline=deadline)
+        return guess, dict(self.solver.report), count
+
+    def state(self):
+        state = {"session": self.id, "attempts": len(self.history), "won": self.won, "over": self.over,
+                 "guesses": [guess for guess, _ in self.history]}
+        if self.over:
+            state["secret"] = self.game.secret_word
+        return state
+
+
+class WordleServer:
+    def __init__(self, tables, workers=Config.SERVER_WORKERS, max_sessions=Config.SERVER_MAX_SESSIONS,
+                 ttl_s=Config.SERVER_SESSION_TTL_S):
+        self.tables = tables
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="solver")
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self.sessions = collections.OrderedDict()  # id -> Session, least recently used first
+        self.load_lock = asyncio.Lock()
+        self.counts = collections.Counter()  # requests per op, errors, evictions
+        self.started = time.monotonic()
+
+    async def run_sync(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    # --- Sessions ---
+    def session(self, request):
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise RequestError("unknown session")
+        self.sessions.move_to_end(session.id)
+        session.last_used = time.monotonic()
+        return session
+
+    def evict(self, session_id):
+        if self.sessions.pop(session_id, None) is not None:
+            self.counts["evicted"] += 1
+
+    async def sweep(self):
+        """Evicts idle sessions; runs for the server's lifetime."""
+        while True:
+            await asyncio.sleep(max(1.0, self.ttl_s / 4))
+            cutoff = time.monotonic() - self.ttl_s
+            for session_id, session in list(self.sessions.items()):
+                if session.last_used >= cutoff:
+                    break  # the rest were used more recently
+                if not session.lock.locked():
+                    self.evict(session_id)
+
+    # --- Operations ---
+    async def op_new(self, request):
+        name = request.get("solver", "Entropy" if HAS_NUMPY else "A*")
+        solver_class = SOLVER_REGISTRY.get(name)
+        if solver_class is None:
+            raise RequestError(f"unknown solver {name!r}")
+        length = int(request.get("length", Config.WORD_LENGTH))
+        hard_mode = bool(request.get("hard", Config.HARD_MODE))
+        if (solver_class, length, hard_mode) not in self.tables.books:
+            async with self.load_lock:
+                await self.run_sync(self.tables.book, solver_class, length, hard_mode)
+        words, guesses, table, index = self.tables.pools[length]
+        if solver_class.REQUIRES_TABLE and table is None:
+            raise RequestError(f"{name} needs numpy")
+        secret = request.get("secret")
+        if secret is not None and secret not in words:
+            raise RequestError("secret not in word list")
+        adversarial = bool(request.get("adversarial", False))
+        if adversarial and secret is not None:
+            raise RequestError("an adversarial game has no secret")
+
+        game = (AdversarialGame if adversarial else WordleGame)(words, table, index, hard_mode, guesses)
+        game.reset_game(secret)
+        # Solver set-up (rankings, candidate arrays) stays off the event loop
+        solver = await self.run_sync(self.tables.make_solver, solver_class, game)
+        while len(self.sessions) >= self.max_sessions:
+            self.evict(next(iter(self.sessions)))
+        session = Session(uuid.uuid4().hex, game, solver)
+        self.sessions[session.id] = session
+        return {"session": session.id, "solver": name, "length": length, "hard": hard_mode, "adversarial": adversarial,
+                "max_attempts": MAX_ATTEMPTS, "candidates": solver.candidate_count()}
+
+    async def op_guess(self, request):
+        session = self.session(request)
+        word = str(request.get("word", "")).strip().lower()
+        async with session.lock:
+            return await self.play(session, word)
+
+    async def play(self, session, word):
+        if session.over:
+            raise RequestError("game is over")
+        if not session.game.is_valid_word(word):
+            raise RequestError("not in dictionary")
+        if session.game.hard_mode:
+            violation = hard_mode_violation(word, session.history)
+            if violation:
+                raise RequestError(violation)
+        feedback = await self.run_sync(session.play, word)
+        return dict(session.state(), feedback=feedback, candidates=session.solver.candidate_count())
+
+    @staticmethod
+    def deadline(request):
+        """The step budget counts from arrival, so time queued for a worker is part of it."""
+        return time.perf_counter() + float(request.get("budget_ms", Config.SERVER_STEP_BUDGET_MS)) / 1000
+
+    async def op_suggest(self, request):
+        session = self.session(request)
+        deadline = self.deadline(request)
+        async with session.lock:
+            if session.over:
+                raise RequestError("game is over")
+            guess, report, count = await self.run_sync(session.suggest, deadline)
+        return {"guess": guess, "report": report, "candidates": count}
+
+    async def op_step(self, request):
+        session = self.session(request)
+        deadline = self.deadline(request)
+        async with session.lock:
+            if session.over:
+                raise RequestError("game is over")
+            guess, report, _ = await self.run_sync(session.suggest, deadline)
+            if not guess:
+                raise RequestError("no candidates left")
+            return dict(await self.play(session, guess), guess=guess, report=report)
+
+    async def op_state(self, request):
+        session = self.session(request)
+        return dict(session.state(), candidates=session.solver.candidate_count())
+
+    async def op_close(self, request):
+        self.session(request)
+        self.sessions.pop(request["session"])
+        return {}
+
+    async def op_stats(self, request):
+        return {"sessions": len(self.sessions), "uptime_s": round(time.monotonic() - self.started, 1),
+                "requests": dict(self.counts)}
+
+    # --- Connections ---
+    async def dispatch(self, line):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            request = f"bad JSON: {e}"
+        if not isinstance(request, dict):
+            self.counts["errors"] += 1
+            return {"ok": False, "error": request if isinstance(request, str) else "request must be a JSON object"}
+        reply = {"id": request["id"]} if "id" in request else {}
+        op = request.get("op")
+        handler = getattr(self, f"op_{op}", None) if isinstance(op, str) else None
+        try:
+            if handler is None:
+                raise RequestError(f"unknown op {op!r}")
+            self.counts[op] += 1
+            reply.update(await handler(request), ok=True)
+        except (RequestError, ValueError, TypeError) as e:
+            self.counts["errors"] += 1
+            reply.update(ok=False, error=str(e))
+        return reply
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                reply = await self.dispatch(line)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=Config.SERVER_HOST, port=Config.SERVER_PORT, ready=None):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        sweeper = asyncio.create_task(self.sweep())
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Wordle sessions as line-delimited JSON over TCP.")
+    parser.add_argument("--host", default=Config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=Config.SERVER_WORKERS, help="solver threads")
+    parser.add_argument("--max-sessions", type=int, default=Config.SERVER_MAX_SESSIONS)
+    parser.add_argument("--ttl", type=float, default=Config.SERVER_SESSION_TTL_S, help="idle seconds before eviction")
+    parser.add_argument("--words", default=None, help="word list file (default: the list for each length)")
+    parser.add_argument("--guesses", default=None, help="allowed-guess list (default: the list for each length)")
+    parser.add_argument("--preload", type=int, nargs="*", default=[Config.WORD_LENGTH],
+                        help="word lengths to load before accepting connections")
+    args = parser.parse_args()
+
+    tables = SharedTables(args.words, args.guesses)
+    for length in args.preload:
+        tables.load(length)
+    server = WordleServer(tables, args.workers, args.max_sessions, args.ttl)
+    ready = lambda s: print(f"Listening on {', '.join(str(sock.getsockname()) for sock in s.sockets)}", flush=True)
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
@@ -1,19 +1,122 @@
 # solvers.py
-import collections
-import heapq
+import time
+import instrument
 from config import Config
+from game import hard_mode_violation
+from patterns import compute_feedback, decode_pattern, encode_feedback, hard_mode_mask, HAS_NUMPY
+from wordbank import WordBank
+
+if HAS_NUMPY:
+    import numpy as np
+
+def deadline_passed(deadline):
+    """True once time.perf_counter() reaches `deadline` (None never passes)."""
+    return deadline is not None and time.perf_counter() >= deadline
 
 class WordleSolver:
+    REQUIRES_TABLE = False  # True if the solver only works with a PatternTable
+
     def __init__(self, game_instance):
         self.game = game_instance
-        self.candidates = []
+        self.table = game_instance.pattern_table
+        self.index = game_instance.constraint_index
+        # With a pattern table the surviving words are tracked as answer
+        # indices, with a constraint index as a bitset; the word list is
+        # only materialized when asked for.
+        self.candidate_ids = None
+        self.candidate_bits = None
+        self._candidates = []
         self.nodes_expanded = 0 
+        # (guess, feedback code) pairs seen this game, and an optional
+        # OpeningBook consulted before any search on the early turns
+        self.history = []
+        self.opening_book = None
+        # In hard mode, a boolean mask over the table's guesses still allowed
+        # (None: every guess is). Candidates always satisfy hard mode.
+        self.guess_pool = None
+        # How far the last solve_step got, see solve_step
+        self.report = {}
+
+    @property
+    def candidates(self):
+        if self._candidates is None:
+            if self.candidate_ids is not None:
+                self._candidates = self.table.words_for(self.candidate_ids)
+            else:
+                self._candidates = self.index.words_for(self.candidate_bits)
+        return self._candidates
+
+    @candidates.setter
+    def candidates(self, words):
+        self._candidates = words
+        self.candidate_ids = None
+        self.candidate_bits = None
 
     def reset(self):
-        self.candidates = list(self.game.full_dictionary)
+        if self.table is not None:
+            self.candidate_ids = self.table.all_answer_ids()
+            self._candidates = None
+        elif self.index is not None:
+            self.candidate_bits = self.index.full
+            self._candidates = None
+        else:
+            # The dictionary is never mutated, so it is shared, not copied
+            self.candidates = self.game.full_dictionary
         self.nodes_expanded = 0
+        self.history = []
+        self.guess_pool = None
+
+    def candidate_count(self):
+        if self.candidate_ids is not None:
+            return len(self.candidate_ids)
+        if self.candidate_bits is not None:
+            return self.index.count(self.candidate_bits)
+        return len(self._candidates)
+
+    def first_candidate(self):
+        """First surviving word in dictionary order (None if there is none)."""
+        if self.candidate_ids is not None:
+            return self.table.answers[int(self.candidate_ids[0])] if len(self.candidate_ids) else None
+        if self.candidate_bits is not None:
+            bits = self.candidate_bits
+            return self.index.words[(bits & -bits).bit_length() - 1] if bits else None
+        return self._candidates[0] if self._candidates else None
+
+    def last_candidate(self):
+        """Last surviving word in dictionary order (None if there is none)."""
+        if self.candidate_ids is not None:
+            return self.table.answers[int(self.candidate_ids[-1])] if len(self.candidate_ids) else None
+        if self.candidate_bits is not None:
+            bits = self.candidate_bits
+            return self.index.words[bits.bit_length() - 1] if bits else None
+        return self._candidates[-1] if self._candidates else None
 
     def filter_candidates(self, last_guess, feedback):
+        profiler = instrument.active
+        if profiler is None:
+            return self._filter_candidates(last_guess, feedback)
+        start = profiler.start()
+        profiler.count("candidates_scanned", self.candidate_count())
+        self._filter_candidates(last_guess, feedback)
+        profiler.stop("filter_candidates", start)
+
+    def _filter_candidates(self, last_guess, feedback):
+        code = encode_feedback(feedback)
+        self.history.append((last_guess, code))
+        if self.game.hard_mode and self.table is not None:
+            mask = hard_mode_mask(self.table.guesses.letters, last_guess, feedback)
+            self.guess_pool = mask if self.guess_pool is None else self.guess_pool & mask
+        if self.candidate_ids is not None:
+            new_ids = self.table.filter_ids(self.candidate_ids, last_guess, code)
+            if new_ids is not None:
+                self.candidate_ids = new_ids
+                self._candidates = None
+                return
+        elif self.candidate_bits is not None:
+            self.candidate_bits = self.index.filter(self.candidate_bits, last_guess, feedback)
+            self._candidates = None
+            return
+
         new_candidates = []
         for word in self.candidates:
             if self.is_consistent(word, last_guess, feedback):
@@ -21,70 +124,537 @@ class WordleSolver:
         self.candidates = new_candidates
 
     def is_consistent(self, candidate, guess, feedback):
-        temp_counts = collections.Counter(candidate)
-        sim_feedback = [0] * 5
-        
-        for i in range(5):
-            if guess[i] == candidate[i]:
-                sim_feedback[i] = 2
-                temp_counts[guess[i]] -= 1
-        for i in range(5):
-            if sim_feedback[i] == 0:
-                if guess[i] in temp_counts and temp_counts[guess[i]] > 0:
-                    sim_feedback[i] = 1
-                    temp_counts[guess[i]] -= 1
-        return sim_feedback == feedback
-
-    def solve_step(self): 
+        return compute_feedback(guess, candidate) == list(feedback)
+
+    def solve_step(self, deadline=None):
+        """
+        Next guess. With a `deadline` (a time.perf_counter() value) every
+        solver is anytime: it returns the best guess found when time runs
+        out. `self.report` then says how far it got: the search depth the
+        guess comes from, whether the search was complete, and elapsed_ms.
+        """
+        profiler = instrument.active
+        if profiler is None:
+            return self._solve_step(deadline)
+        start = profiler.start()
+        guess = self._solve_step(deadline)
+        profiler.stop("solve_step", start)
+        if self.opening_book is not None:
+            profiler.count("book_hit" if self.report.get("book") else "book_miss")
+        return guess
+
+    def _solve_step(self, deadline):
+        start = time.perf_counter()
+        if self.opening_book is not None:
+            guess = self.opening_book.lookup(self.history)
+            if guess is not None:
+                self.nodes_expanded += 1
+                self.report = {"depth": 0, "complete": True, "book": True,
+                               "elapsed_ms": (time.perf_counter() - start) * 1000}
+                return guess
+        self.report = {"depth": 1, "complete": True}
+        guess = self.choose_guess(deadline)
+        self.report["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        return guess
+
+    def choose_guess(self, deadline=None):
+        """
+        Search for the next guess. Implemented by every solver; those that
+        can run long stop at `deadline` and update self.report.
+        """
         raise NotImplementedError
 
+    def iter_ranked_guesses(self, k):
+        """
+        Scores every allowed guess by the expected number of candidates
+        left after it (sum of squared bucket sizes over the candidate count,
+        a win leaving none) and yields (scanned, total, top) after each block
+        of guesses, `top` being the k best (guess, expected) pairs so far.
+        Stopping the iteration between blocks cancels the scan.
+        """
+        n = self.candidate_count()
+        if n == 0:
+            yield 0, 0, []
+            return
+        if self.candidate_ids is not None:
+            yield from self._iter_ranked_ids(k, n)
+            return
+        candidates = self.candidates
+        guesses = self.game.allowed_guesses
+        if self.game.hard_mode:
+            history = [(g, decode_pattern(code, len(g))) for g, code in self.history]
+            guesses = [g for g in guesses if hard_mode_violation(g, history) is None]
+        top = []
+        block = max(1, 4096 // n)
+        for lo in range(0, len(guesses), block):
+            for guess in guesses[lo:lo + block]:
+                buckets = {}
+                for word in candidates:
+                    key = tuple(compute_feedback(guess, word))
+                    buckets[key] = buckets.get(key, 0) + 1
+                win = buckets.get((2,) * len(guess), 0)
+                top.append(((sum(c * c for c in buckets.values()) - win) / n, guess))
+            top = sorted(top)[:k]
+            yield min(lo + block, len(guesses)), len(guesses), [(g, e) for e, g in top]
+
+    def _iter_ranked_ids(self, k, n):
+        table = self.table
+        best_ids = np.empty(0, dtype=np.intp)
+        best_scores = np.empty(0)
+        for lo, hi, sizes, _ in table.iter_bucket_sizes(self.candidate_ids):
+            # A win (a bucket of one) leaves no candidates
+            sizes = sizes.astype(np.int64)
+            scores = (sizes * sizes).sum(axis=1) / n
+            if self.guess_pool is not None:
+                scores[~self.guess_pool[lo:hi]] = np.inf
+            # Earlier guesses come first, so a stable sort keeps the lower id on ties
+            ids = np.concatenate([best_ids, np.arange(lo, hi)])
+            scores = np.concatenate([best_scores, scores])
+            keep = np.argsort(scores, kind="stable")[:k]
+            keep = keep[np.isfinite(scores[keep])]
+            best_ids, best_scores = ids[keep], scores[keep]
+            yield hi, len(table.guesses), [(table.guesses[int(g)], float(e)) for g, e in zip(best_ids, best_scores)]
+
 # --- Concrete Implementations ---
 
 class BFSSolver(WordleSolver):
-    def solve_step(self):
-        queue = collections.deque(self.candidates)
-        if queue:
+    def choose_guess(self, deadline=None):
+        # Front of the queue: the first surviving word in dictionary order
+        guess = self.first_candidate()
+        if guess is not None:
             self.nodes_expanded += 1
-            return queue.popleft()
-        return None
+        return guess
 
 class DFSSolver(WordleSolver):
-    def solve_step(self):
-        if self.candidates:
+    def choose_guess(self, deadline=None):
+        # Top of the stack: the last surviving word in dictionary order
+        guess = self.last_candidate()
+        if guess is not None:
             self.nodes_expanded += 1
-            return self.candidates[-1]
-        return None
+        return guess
 
-class UCSSolver(WordleSolver):
-    def get_cost(self, word):
+class ScoredSolver(WordleSolver):
+    """
+    Picks the surviving word with the lowest static score, ties broken
+    alphabetically (what popping a heap of (score, word) gives). Scores
+    never change, so each word list is ranked once (WordBank.ranked) and a
+    step is an argmin of the rank over the survivors, or a walk of the
+    sorted order that skips eliminated words. No heap is built.
+
+    `score` is a classmethod: the ranking is cached on the shared,
+    long-lived word bank, so it must not hold on to a solver instance.
+    """
+    @classmethod
+    def score(cls, word):
+        raise NotImplementedError
+
+    def __init__(self, game_instance):
+        super().__init__(game_instance)
+        if self.table is not None:
+            self.bank = self.table.answers
+        elif self.index is not None:
+            self.bank = self.index.words
+        else:
+            self.bank = WordBank.of(self.game.full_dictionary)
+        self.order, self.rank = self.bank.ranked(type(self), type(self).score)
+
+    def best_candidate(self):
+        if self.candidate_ids is not None:
+            ids = self.candidate_ids
+            if not len(ids): return None
+            return self.bank[int(ids[np.argmin(self.rank[ids])])]
+        if self.candidate_bits is not None:
+            bits = self.candidate_bits
+            if not bits: return None
+            if self.index.count(bits) * 64 >= len(self.bank):
+                # Dense: the first survivor in rank order is a few steps away
+                for i in self.order:
+                    if bits >> i & 1:
+                        return self.bank[i]
+            best = None
+            while bits:
+                low = bits & -bits
+                i = low.bit_length() - 1
+                if best is None or self.rank[i] < self.rank[best]: best = i
+                bits ^= low
+            return self.bank[best]
+        if not self._candidates: return None
+        return min(self._candidates, key=lambda w: self.rank[self.bank.index_of(w)])
+
+    def choose_guess(self, deadline=None):
+        # Every survivor is a frontier node ranked for this pick
+        count = self.candidate_count()
+        guess = self.best_candidate()
+        if guess is not None:
+            self.nodes_expanded += count
+        return guess
+
+class UCSSolver(ScoredSolver):
+    @staticmethod
+    def get_cost(word):
         score = 0; seen = set()
         for char in word:
             if char not in seen:
                 score += Config.LETTER_FREQ.get(char, 0)
                 seen.add(char)
         return 100 - score 
-        
-    def solve_step(self):
-        pq = []
-        for word in self.candidates: 
-            heapq.heappush(pq, (self.get_cost(word), word))
-        if pq:
-            self.nodes_expanded += 1
-            return heapq.heappop(pq)[1]
-        return None
 
-class AStarSolver(WordleSolver):
-    def heuristic(self, word):
+    @classmethod
+    def score(cls, word):
+        return cls.get_cost(word)
+
+class AStarSolver(ScoredSolver):
+    @staticmethod
+    def heuristic(word):
         score = 0
         for i, char in enumerate(word): 
             score += Config.LETTER_FREQ.get(char, 0)
         return -score
-        
-    def solve_step(self):
-        pq = []; g_n = 1 
-        for word in self.candidates: 
-            heapq.heappush(pq, (g_n + self.heuristic(word), word))
-        if pq:
+
+    @classmethod
+    def score(cls, word):
+        g_n = 1
+        return g_n + cls.heuristic(word)
+
+def probe_cost(word):
+    """Static order of anytime guess scans: distinct frequent letters first."""
+    return -sum(Config.LETTER_FREQ.get(char, 0) for char in set(word))
+
+def probe_order(table):
+    """Guess ids of `table` sorted by probe_cost (ranked once per word list)."""
+    order, _ = table.guesses.ranked(probe_cost, probe_cost)
+    return order
+
+class EntropySolver(WordleSolver):
+    """
+    Picks the allowed guess whose feedback splits the remaining candidates
+    most evenly, i.e. maximizes the Shannon entropy of the pattern
+    distribution. Needs a PatternTable: the distribution of every guess is
+    one histogram row from PatternTable.bucket_counts.
+
+    With a deadline, guesses are scored in blocks of about SCAN_CELLS
+    patterns in probe_order, and the best one scored so far is played when
+    time runs out.
+    """
+    REQUIRES_TABLE = True
+    SCAN_CELLS = 1 << 21
+
+    def __init__(self, game_instance):
+        super().__init__(game_instance)
+        if self.table is None:
+            raise RuntimeError("EntropySolver requires a PatternTable (numpy)")
+        self.scan_order = np.asarray(probe_order(self.table), dtype=np.int32)
+
+    def count_scored(self, scored):
+        """Each scored guess is one expanded node."""
+        self.nodes_expanded += scored
+        if instrument.active is not None:
+            instrument.active.count("guesses_scored", scored)
+
+    def score_guesses(self, guess_ids=None):
+        """Entropy (bits) of every allowed guess (or of `guess_ids`) over the current candidates."""
+        ids = self.candidate_ids
+        n = len(ids)
+        scores = np.empty(len(self.table.guesses) if guess_ids is None else len(guess_ids))
+        # H = log2(n) - sum(c * log2(c)) / n, with 0 * log2(0) = 0, one
+        # block of guesses at a time (the winning bucket, of size 1, adds 0)
+        for lo, hi, sizes, _ in self.table.iter_bucket_sizes(ids, guess_ids):
+            c = sizes.astype(np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                plogp = np.where(c > 0, c * np.log2(c), 0.0)
+            scores[lo:hi] = np.log2(n) - plogp.sum(axis=1) / n
+        return scores
+
+    def choose_guess(self, deadline=None):
+        ids = self.candidate_ids
+        if ids is None or len(ids) == 0:
+            return None
+        if len(ids) <= 2:
             self.nodes_expanded += 1
-            return heapq.heappop(pq)[1]
-        return None
\ No newline at end of file
+            return self.first_candidate()
+
+        # Tie-break toward guesses that can still be the answer
+        guess_ids = self.table.answer_guess_ids[ids]
+        guess_ids = guess_ids[guess_ids >= 0]
+        pool = self.guess_pool
+        if deadline is None:
+            scores = self.score_guesses()
+            self.count_scored(len(scores))
+            scores[guess_ids] += 1.0 / len(ids)
+            if pool is not None:
+                scores[~pool] = -np.inf
+            return self.table.guesses[int(np.argmax(scores))]
+
+        is_candidate = np.zeros(len(self.table.guesses), dtype=bool)
+        is_candidate[guess_ids] = True
+        rows = max(64, self.SCAN_CELLS // len(ids))
+        best_score, best_guess, scored = -1.0, None, 0
+        for lo in range(0, len(self.scan_order), rows):
+            if deadline_passed(deadline):
+                break
+            block = self.scan_order[lo:lo + rows]
+            scores = self.score_guesses(block) + is_candidate[block] / len(ids)
+            if pool is not None:
+                scores[~pool[block]] = -np.inf
+            i = int(np.argmax(scores))
+            if scores[i] > best_score:
+                best_score, best_guess = scores[i], int(block[i])
+            scored += len(block)
+        self.count_scored(scored)
+        self.report.update(complete=scored == len(self.scan_order), scored=scored, of=len(self.scan_order))
+        if best_guess is None:
+            self.report["depth"] = 0
+            return self.first_candidate()
+        return self.table.guesses[best_guess]
+
+class _SearchTimeout(Exception):
+    pass
+
+class LookaheadSolver(WordleSolver):
+    """
+    Depth-limited expectimax over (candidate set, guess) -> feedback buckets,
+    minimizing the expected number of guesses still needed.
+
+    A node is a set of surviving answer ids. Only the `beam` guesses with the
+    lowest one-ply lower bound are expanded, in that order, and a guess is
+    dropped as soon as its bound reaches the best value found (branch and
+    bound). Horizon nodes are scored by the bound itself, which for this
+    cost is "split into as many buckets as possible". Searched nodes go into
+    a transposition table keyed by a hash of the candidate set; the same
+    sets recur across moves and games, so the table persists across resets.
+
+    A move deepens one guess at a time up to `depth` and stops at its
+    deadline, if one is given (or after `budget_ms`, if set). Without
+    either the search always reaches `depth`, so its moves do not depend
+    on machine speed. Guesses are ranked in blocks of about
+    SCAN_CELLS patterns, so even the full-dictionary root can be cut short.
+    """
+    REQUIRES_TABLE = True
+    TABLE_LIMIT = 200_000  # Transposition entries kept before the table is cleared
+    SORT_LIMIT = 128       # Candidate sets up to this size are profiled by sorting rows
+    SCAN_CELLS = 1 << 21   # Pattern cells ranked between two deadline checks
+
+    def __init__(self, game_instance, depth=Config.LOOKAHEAD_DEPTH, beam=Config.LOOKAHEAD_BEAM,
+                 budget_ms=Config.LOOKAHEAD_BUDGET_MS):
+        super().__init__(game_instance)
+        if self.table is None:
+            raise RuntimeError(f"{type(self).__name__} requires a PatternTable (numpy)")
+        self.depth = depth
+        self.beam = beam
+        self.budget_ms = budget_ms
+        self.scan_order = np.asarray(probe_order(self.table), dtype=np.int32)
+        # (size, hash) -> (depth, value, guess id, exact, beam ids, beam bounds)
+        self.transpositions = {}
+        self._deadline = None
+
+    # --- Cost model (expected number of guesses) ---
+    @staticmethod
+    def bound_for(size):
+        """Admissible lower bound on the guesses needed for `size` candidates."""
+        return 2.0 - 1.0 / size if size else 0.0
+
+    def one_ply_bounds(self, ids, guess_ids):
+        """
+        Lower bound on the value of each guess over `ids`, plus a tie-break
+        key: 1 + sum(bound_for(bucket)) / n over the non-winning buckets.
+        """
+        n = len(ids)
+        wins, buckets, largest = self.profile(ids, guess_ids)
+        values = 1.0 + (2.0 * (n - wins) - buckets) / n
+        return values, largest
+
+    def expand(self, ids, guess_id, depth, bound):
+        """Value of `guess_id` over `ids`, or some value >= bound once it cannot win."""
+        n = len(ids)
+        children = self.split(ids, guess_id)
+        total = 1.0 + sum(len(c) * self.bound_for(len(c)) for c in children) / n
+        for child in children:
+            if total >= bound:
+                break
+            weight = len(child) / n
+            optimistic = self.bound_for(len(child))
+            value, _ = self.search(child, depth, optimistic + (bound - total) / weight)
+            total += weight * (value - optimistic)
+        return total
+
+    # --- Search ---
+    def profile(self, ids, guess_ids):
+        """
+        Per guess: whether it can win outright (0/1), how many non-winning
+        feedback buckets it splits `ids` into and the size of the largest.
+        """
+        win = self.table.win_code
+        if len(ids) <= self.SORT_LIMIT:
+            if instrument.active is not None:
+                instrument.active.count("feedback_evals", len(guess_ids) * len(ids))
+            rows = np.sort(self.table.matrix[np.ix_(guess_ids, ids)], axis=1)
+            wins = (rows[:, -1] == win).astype(np.int32)  # the win code is the largest code
+            starts = np.ones(rows.shape, dtype=bool)
+            starts[:, 1:] = rows[:, 1:] != rows[:, :-1]
+            buckets = starts.sum(axis=1) - wins
+            pos = np.arange(rows.shape[1])
+            run_start = np.maximum.accumulate(np.where(starts, pos, 0), axis=1)
+            runs = np.where(rows == win, 0, pos - run_start + 1)
+            return wins, buckets, runs.max(axis=1)
+        wins = np.empty(len(guess_ids), dtype=np.int64)
+        buckets = np.empty(len(guess_ids), dtype=np.int64)
+        largest = np.empty(len(guess_ids), dtype=np.int64)
+        for lo, hi, sizes, block_wins in self.table.iter_bucket_sizes(ids, guess_ids):
+            wins[lo:hi] = block_wins
+            buckets[lo:hi] = (sizes > 0).sum(axis=1)
+            largest[lo:hi] = sizes.max(axis=1)
+        return wins, buckets, largest
+
+    def rank_guesses(self, ids, on_improve=None, pool=None):
+        """
+        (guess ids, bounds) of the `beam` lowest-bound guesses over `ids`
+        (among `pool` if given), best first. Scans in blocks and raises
+        _SearchTimeout between two blocks once the deadline has passed.
+        """
+        rows = max(self.beam, self.SCAN_CELLS // len(ids))
+        top = np.empty(0, dtype=np.int32)
+        top_values = np.empty(0)
+        top_ties = np.empty(0, dtype=np.int64)
+        for lo in range(0, len(self.scan_order), rows):
+            if lo and deadline_passed(self._deadline):
+                raise _SearchTimeout()
+            block = self.scan_order[lo:lo + rows]
+            values, ties = self.one_ply_bounds(ids, block)
+            if instrument.active is not None:
+                instrument.active.count("guesses_scored", len(block))
+            if pool is not None:
+                values = np.where(pool[block], values, np.inf)
+            top = np.concatenate([top, block])
+            top_values = np.concatenate([top_values, values])
+            top_ties = np.concatenate([top_ties, ties.astype(np.int64)])
+            keep = np.lexsort((top_ties, top_values))[:self.beam]
+            keep = keep[np.isfinite(top_values[keep])]
+            top, top_values, top_ties = top[keep], top_values[keep], top_ties[keep]
+            if on_improve: on_improve(int(top[0]))
+        return top, top_values
+
+    def split(self, ids, guess_id):
+        """Non-winning feedback buckets of a guess over `ids`, largest first (each still sorted)."""
+        row = self.table.matrix[guess_id][ids]
+        order = np.argsort(row, kind="stable")
+        codes = row[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(codes)]
+        children = [ids[order[lo:hi]] for lo, hi in zip(starts, ends) if codes[lo] != self.table.win_code]
+        children.sort(key=len, reverse=True)
+        return children
+
+    def search(self, ids, depth, bound, on_improve=None, pool=None):
+        """
+        (value, guess id) of the best guess over `ids` looking `depth`
+        guesses ahead. A value >= bound is only a lower bound on the truth.
+        on_improve(guess id) is called whenever the best guess changes.
+
+        `pool` (hard mode) restricts this node's guesses only; deeper nodes
+        may use any guess, an optimistic relaxation that keeps the bounds
+        admissible.
+        """
+        n = len(ids)
+        if n <= 2:
+            return self.bound_for(n), self.table.answer_guess_ids[ids[0]]
+        key = (n, hash(ids.tobytes())) if pool is None else (n, hash(ids.tobytes()), hash(pool.tobytes()))
+        entry = self.transpositions.get(key)
+        hit = entry is not None and entry[0] >= depth and (entry[3] or entry[1] >= bound)
+        if instrument.active is not None:
+            instrument.active.count("tt_hit" if hit else "tt_miss")
+        if hit:
+            return entry[1], entry[2]
+        if deadline_passed(self._deadline):
+            raise _SearchTimeout()
+        self.nodes_expanded += 1
+
+        if entry is not None:
+            top, values = entry[4], entry[5]
+        else:
+            top, values = self.rank_guesses(ids, on_improve if depth == 1 else None, pool)
+        best_value, best_guess = float(values[0]), int(top[0])
+        if depth > 1:
+            best_value = float("inf")
+            for g, lower in zip(top, values):
+                if lower >= min(best_value, bound):
+                    break
+                value = self.expand(ids, int(g), depth - 1, min(best_value, bound))
+                if value < best_value:
+                    best_value, best_guess = value, int(g)
+                    if on_improve: on_improve(best_guess)
+            if best_value == float("inf"):
+                best_value = float(values[0])
+
+        if len(self.transpositions) >= self.TABLE_LIMIT:
+            self.transpositions.clear()
+        self.transpositions[key] = (depth, best_value, best_guess, best_value < bound, top, values)
+        return best_value, best_guess
+
+    def choose_guess(self, deadline=None):
+        ids = self.candidate_ids
+        if ids is None or len(ids) == 0:
+            return None
+        if len(ids) <= 2:
+            self.nodes_expanded += 1
+            return self.first_candidate()
+
+        # Iterative deepening: each finished depth leaves its guess (and its
+        # nodes in the transposition table, which speed up the next depth).
+        # On timeout the unfinished depth's best root guess is kept if it
+        # has one, else the last finished depth's.
+        if deadline is None and self.budget_ms:
+            deadline = time.perf_counter() + self.budget_ms / 1000
+        self._deadline = deadline
+        guess_id, reached, complete = None, 0, False
+        try:
+            for depth in range(1, self.depth + 1):
+                found = []
+                _, guess_id = self.search(ids, depth, float("inf"), on_improve=found.append, pool=self.guess_pool)
+                reached = depth
+            complete = True
+        except _SearchTimeout:
+            if found:
+                guess_id, reached = found[-1], depth
+        finally:
+            self._deadline = None
+        self.report.update(depth=reached, complete=complete)
+        if guess_id is None:
+            return self.first_candidate()
+        return self.table.guesses[int(guess_id)]
+
+class MinimaxSolver(LookaheadSolver):
+    """
+    LookaheadSolver minimizing the worst-case number of guesses instead:
+    a guess is worth 1 + the value of its worst bucket. Ties between equal
+    bounds go to the guess with the smallest largest bucket, then to one
+    that can still be the answer.
+    """
+    @staticmethod
+    def bound_for(size):
+        return float(min(size, 2))
+
+    def one_ply_bounds(self, ids, guess_ids):
+        wins, _, largest = self.profile(ids, guess_ids)
+        values = 1.0 + np.minimum(largest, 2).astype(np.float64)
+        return values, 2 * largest - wins
+
+    def expand(self, ids, guess_id, depth, bound):
+        children = self.split(ids, guess_id)
+        total = 1.0 + (self.bound_for(len(children[0])) if children else 0.0)
+        for child in children:
+            if total >= bound:
+                break
+            value, _ = self.search(child, depth, bound - 1.0)
+            total = max(total, 1.0 + value)
+        return total
+
+# Display name -> solver class, shared by the GUI, the benchmarks and the CLIs
+SOLVER_REGISTRY = {
+    "BFS": BFSSolver,
+    "DFS": DFSSolver,
+    "UCS": UCSSolver,
+    "A*": AStarSolver,
+    "Entropy": EntropySolver,
+    "Lookahead": LookaheadSolver,
+    "Minimax": MinimaxSolver,
+}
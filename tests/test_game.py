@@ -0,0 +1,28 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from game import AdversarialGame
+from patterns import PatternTable, compute_feedback
+
+ANSWERS = ["crane", "slate", "trace", "crate", "grace", "brace", "plane", "shine"]
+GUESSES = ANSWERS + ["adieu"]
+
+
+def test_adversarial_guess_outside_the_table():
+    table = PatternTable(ANSWERS)  # "adieu" is an allowed guess, but not one of the table's rows
+    game = AdversarialGame(ANSWERS, table, guess_list=GUESSES)
+    assert table.row("adieu") is None
+    feedback = game.check_guess("adieu")
+    survivors = game.survivors()
+    assert survivors and all(compute_feedback("adieu", word) == feedback for word in survivors)
+    # The largest bucket was chosen
+    sizes = {}
+    for word in ANSWERS:
+        key = tuple(compute_feedback("adieu", word))
+        sizes[key] = sizes.get(key, 0) + 1
+    assert len(survivors) == max(sizes.values())
+    # Checking it again narrows nothing, and in-table guesses keep working
+    assert game.check_guess("adieu") == feedback and game.survivors() == survivors
+    game.check_guess("crane")
+    assert game.secret_word in survivors
@@ -0,0 +1,48 @@
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import instrument
+from patterns import PatternTable
+
+
+def random_words(length, count, seed=0):
+    rng = random.Random(seed)
+    return sorted({"".join(rng.choice("abcdefghijklmnoprstu") for _ in range(length)) for _ in range(count)})
+
+
+def dense_reference(table, ids):
+    counts = table.bucket_counts(ids).astype(np.int64)
+    wins = counts[:, table.win_code].copy()
+    counts[:, table.win_code] = 0
+    return counts, wins
+
+
+@pytest.mark.parametrize("length", [5, 8])
+def test_late_game_bucket_sizes_match_dense_histograms(length):
+    words = random_words(length, 600)
+    table = PatternTable(words)
+    ids = np.sort(np.random.default_rng(1).choice(len(words), 20, replace=False)).astype(np.int32)
+    dense, dense_wins = dense_reference(table, ids)
+    blocks = list(table.iter_bucket_sizes(ids))
+    sizes = np.concatenate([block for _, _, block, _ in blocks]).astype(np.int64)
+    wins = np.concatenate([w for _, _, _, w in blocks])
+    assert (wins == dense_wins).all()
+    assert ((sizes * sizes).sum(axis=1) == (dense * dense).sum(axis=1)).all()
+    assert (sizes.max(axis=1) == dense.max(axis=1)).all()
+    assert ((sizes > 0).sum(axis=1) == (dense > 0).sum(axis=1)).all()
+
+
+def test_late_game_scoring_cost_does_not_scale_with_codes():
+    """With 20 survivors, the work per guess is 20 cells whether there are 3**5 or 3**8 codes."""
+    work = {}
+    for length in (5, 8):
+        words = random_words(length, 600)
+        table = PatternTable(words)
+        ids = np.arange(20, dtype=np.int32)
+        with instrument.Profiler() as profiler:
+            widths = {block.shape[1] for _, _, block, _ in table.iter_bucket_sizes(ids)}
+        assert widths == {len(ids)}
+        work[length] = profiler.counters["feedback_evals"] / len(table.guesses)
+    assert work[5] == work[8] == 20
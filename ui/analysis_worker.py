@@ -0,0 +1,91 @@
+# Live candidate analysis for the GUI side panel
+import time
+import queue
+import threading
+from config import Config
+from solvers import WordleSolver
+
+
+class AnalysisWorker:
+    """
+    Tracks the candidates of the game on screen on a daemon thread and ranks
+    the next guesses by expected remaining candidates (see
+    WordleSolver.iter_ranked_guesses).
+
+    Like SolverWorker, the Tk thread only sends commands and polls. Results
+    are (candidate count, scanned, total, top guesses, complete) tuples: the
+    count is posted as soon as a guess is filtered, then the partial ranking
+    every ANALYSIS_UPDATE_MS while the scan runs. Any new command cancels
+    the scan in progress at the next block of guesses.
+    """
+    def __init__(self, top_k=Config.ANALYSIS_TOP_K):
+        self.top_k = top_k
+        self.inbox = queue.Queue()
+        self.results = queue.Queue()
+        self.epoch = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # --- Tk thread ---
+    def reset(self, game):
+        """Starts tracking a new game (its hard_mode already set)."""
+        self.epoch += 1
+        self.inbox.put(("reset", self.epoch, game))
+
+    def feedback(self, guess, feedback, rank=True):
+        """Filters the candidates; with `rank`, then ranks the next guesses."""
+        self.inbox.put(("feedback", self.epoch, guess, feedback, rank))
+
+    def cancel(self):
+        self.inbox.put(("cancel", self.epoch))
+
+    def poll(self):
+        """Newest result of the current game, or None."""
+        latest = None
+        while True:
+            try:
+                epoch, *result = self.results.get_nowait()
+            except queue.Empty:
+                return latest
+            if epoch == self.epoch:
+                latest = tuple(result)
+
+    def stop(self):
+        self.inbox.put(None)
+
+    # --- Worker thread ---
+    def run(self):
+        tracker = None
+        while True:
+            command = self.inbox.get()
+            if command is None:
+                return
+            kind, epoch = command[0], command[1]
+            if epoch != self.epoch:
+                continue
+            if kind == "cancel":
+                if tracker is not None:
+                    self.results.put((epoch, tracker.candidate_count(), 0, 0, [], True))
+                continue
+            if kind == "reset":
+                tracker = WordleSolver(command[2])
+                tracker.reset()
+                rank = True
+            else:
+                _, _, guess, feedback, rank = command
+                tracker.filter_candidates(guess, feedback)
+            count = tracker.candidate_count()
+            self.results.put((epoch, count, 0, 0, [], not rank))
+            # Commands already queued make this ranking stale before it starts
+            if rank and self.inbox.empty():
+                self.rank(tracker, epoch, count)
+
+    def rank(self, tracker, epoch, count):
+        interval = Config.ANALYSIS_UPDATE_MS / 1000
+        posted = time.perf_counter()
+        for scanned, total, top in tracker.iter_ranked_guesses(self.top_k):
+            if not self.inbox.empty():
+                return
+            if scanned == total or time.perf_counter() - posted >= interval:
+                self.results.put((epoch, count, scanned, total, top, scanned == total))
+                posted = time.perf_counter()
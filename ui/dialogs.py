@@ -1,17 +1,30 @@
 # Handle various dialog popups in the application
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
+import time
+import queue
+import random
 import threading
 from config import Config
-from benchmark import PerformanceBenchmark
+from benchmark import PerformanceBenchmark, SolverComparison, secret_stream, MAX_ATTEMPTS
+from instrument import format_summary
 
-# Matplotlib Check
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+# Matplotlib is slow to import and only the benchmark dashboard needs it,
+# so it is imported when that dialog is first opened (see load_matplotlib).
+plt = None
+FigureCanvasTkAgg = None
+
+def load_matplotlib():
+    """Imports matplotlib + the TkAgg canvas once; False if not installed."""
+    global plt, FigureCanvasTkAgg
+    if plt is None:
+        try:
+            import matplotlib.pyplot as pyplot
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_class
+        except ImportError:
+            return False
+        plt, FigureCanvasTkAgg = pyplot, canvas_class
+    return True
 
 class BaseDialog(tk.Toplevel):
     """A base class for styled popups"""
@@ -57,7 +70,7 @@ class ResultsDialog(BaseDialog):
                   bg=Config.COLOR_ABSENT, fg="white", font=("Arial", 11, "bold"), width=10).pack(side=tk.LEFT, padx=10)
 
 class HintDialog(BaseDialog):
-    def __init__(self, parent, char, idx):
+    def __init__(self, parent, char, idx, length=Config.WORD_LENGTH):
         super().__init__(parent, "Hint", 350, 180)
         
         tk.Label(self, text="HINT", font=("Helvetica Neue", 20, "bold"), 
@@ -66,7 +79,7 @@ class HintDialog(BaseDialog):
         block_frame = tk.Frame(self, bg=Config.COLOR_BG)
         block_frame.pack(pady=10)
         
-        for i in range(5):
+        for i in range(length):
             if i == idx:
                 bg_color = Config.COLOR_CORRECT
                 text = char.upper()
@@ -86,15 +99,32 @@ class HintDialog(BaseDialog):
 
 class BenchmarkDialog(tk.Toplevel):
     """Handles the complex Performance Dashboard"""
-    def __init__(self, parent, word_list, solver_classes):
+    PUSH_INTERVAL = 0.1  # Seconds between partial snapshots sent by the worker
+    METRICS = [("Time", 'avg_time', 'max_time', "µs", ['#3498db', '#2980b9']),
+               ("Memory", 'avg_mem', 'max_mem', "Bytes", ['#9b59b6', '#8e44ad']),
+               ("Nodes", 'avg_nodes', 'max_nodes', "Count", ['#e67e22', '#d35400']),
+               ("Guesses", 'avg_guesses', 'max_guesses', "Count", ['#2ecc71', '#27ae60'])]
+    OUTCOMES = list(range(1, MAX_ATTEMPTS + 1)) + ["X"]
+
+    def __init__(self, parent, word_list, solver_classes, pattern_table=None):
         super().__init__(parent)
         self.title("Search Algorithm Assessment")
         self.geometry("1100x900")
         self.configure(bg="white")
         self.word_list = word_list
         self.solver_classes = solver_classes
+        self.pattern_table = pattern_table
+        # The worker thread never touches Tk: it only puts events on this queue,
+        # which the Tk thread drains every Config.DASHBOARD_POLL_MS (see poll_events).
+        self.events = queue.Queue()
+        self.bench = None     # PerformanceBenchmark or SolverComparison while a run is going
+        self.poll_id = None
+        self.layout = False   # Solver names the charts are laid out for (None: single run)
+        self.partial = {}     # Solver name -> (games done, stats) during a comparison
+        self.profiler = None  # instrument.Profiler of the last profiled single run (trace export)
+        self.protocol("WM_DELETE_WINDOW", self.close)
         
-        if not HAS_MATPLOTLIB:
+        if not load_matplotlib():
             tk.Label(self, text="Matplotlib not found!", fg="red").pack()
             return
 
@@ -104,68 +134,310 @@ class BenchmarkDialog(tk.Toplevel):
         ctrl_frame = tk.Frame(self, bg="white")
         ctrl_frame.pack(pady=10)
         
-        tk.Label(ctrl_frame, text="Run 10 Games using:", bg="white", font=("Arial", 12)).pack(side=tk.LEFT)
-        self.algo_combobox = ttk.Combobox(ctrl_frame, values=["BFS", "DFS", "UCS", "A*"], state="readonly")
+        tk.Label(ctrl_frame, text="Run", bg="white", font=("Arial", 12)).pack(side=tk.LEFT)
+        self.games_var = tk.StringVar(value="10")
+        tk.Spinbox(ctrl_frame, from_=1, to=1_000_000, increment=10, width=8,
+                   textvariable=self.games_var).pack(side=tk.LEFT, padx=5)
+        tk.Label(ctrl_frame, text="Games using:", bg="white", font=("Arial", 12)).pack(side=tk.LEFT)
+        self.algo_combobox = ttk.Combobox(ctrl_frame, values=list(self.solver_classes), state="readonly")
         self.algo_combobox.set("A*")
         self.algo_combobox.pack(side=tk.LEFT, padx=10)
         
-        tk.Button(ctrl_frame, text="Start Assessment", bg="#d35400", fg="white",
-                  command=self.run_benchmark).pack(side=tk.LEFT)
+        self.start_btn = tk.Button(ctrl_frame, text="Start Assessment", bg="#d35400", fg="white",
+                                   command=self.run_benchmark)
+        self.start_btn.pack(side=tk.LEFT)
+        self.compare_btn = tk.Button(ctrl_frame, text="Compare All", bg="#2980b9", fg="white",
+                                     command=self.run_comparison)
+        self.compare_btn.pack(side=tk.LEFT, padx=5)
+        self.cancel_btn = tk.Button(ctrl_frame, text="Cancel", state=tk.DISABLED, command=self.cancel_benchmark)
+        self.cancel_btn.pack(side=tk.LEFT)
+        # Counters and phase times of the hot paths (see instrument.py)
+        self.profile_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(ctrl_frame, text="Profile", variable=self.profile_var, bg="white").pack(side=tk.LEFT, padx=5)
+        self.trace_btn = tk.Button(ctrl_frame, text="Export Trace", state=tk.DISABLED, command=self.export_trace)
+        self.trace_btn.pack(side=tk.LEFT)
+
+        self.progress = ttk.Progressbar(self, mode="determinate")
+        self.progress.pack(fill="x", padx=20)
 
         self.insight_frame = tk.LabelFrame(self, text="AI Insights", bg="white", font=("Arial", 10, "bold"))
         self.insight_frame.pack(fill="x", padx=20, pady=5)
         self.insight_lbl = tk.Label(self.insight_frame, text="Select an algorithm and run to see analytics.", 
                                     justify="left", bg="white", fg="#333")
         self.insight_lbl.pack(fill="x", padx=10, pady=10)
+        self.profile_lbl = tk.Label(self.insight_frame, text="", justify="left", font=("Courier", 9),
+                                    bg="white", fg="#333")
+        self.profile_lbl.pack(fill="x", padx=10)
 
         self.chart_frame = tk.Frame(self, bg="white")
         self.chart_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        self.fig = plt.figure(figsize=(10, 6))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_frame)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.build_charts(None)
+
+    def build_charts(self, names):
+        """
+        Lays the figure out for one run (names=None) or a comparison of
+        `names`. This only happens when the layout changes; runs then just
+        move the existing bars and labels (see update_charts).
+        """
+        if self.layout == names: return
+        self.layout = names
+        self.fig.clf()
+        self.charts = []
+        self.hist = None
+
+        if names is None:
+            axes = self.fig.subplots(2, 2).flat
+        else:
+            grid = self.fig.add_gridspec(3, 2)
+            axes = [self.fig.add_subplot(grid[r, c]) for r in range(2) for c in range(2)]
+
+        for ax, (title, avg_key, peak_key, unit, cols) in zip(axes, self.METRICS):
+            ax.set_title(title); ax.set_ylabel(unit)
+            if names is None:
+                rects = list(ax.bar(['Avg', 'Peak'], [0, 0], color=cols))
+                slots = [(None, avg_key), (None, peak_key)]
+            else:
+                # Grouped bars: Avg and Peak side by side for every solver
+                xs = range(len(names))
+                avg = ax.bar([x - 0.2 for x in xs], [0] * len(names), width=0.4, color=cols[0], label='Avg')
+                peak = ax.bar([x + 0.2 for x in xs], [0] * len(names), width=0.4, color=cols[1], label='Peak')
+                ax.set_xticks(list(xs)); ax.set_xticklabels(names)
+                ax.legend(fontsize=8)
+                rects = list(avg) + list(peak)
+                slots = [(n, avg_key) for n in names] + [(n, peak_key) for n in names]
+            entries = [(rect, ax.text(rect.get_x() + rect.get_width() / 2, 0, '', ha='center', va='bottom',
+                                      fontsize=8), name, key)
+                       for rect, (name, key) in zip(rects, slots)]
+            self.charts.append((ax, entries))
+
+        if names is not None:
+            # Guess-count histogram, one bar series per solver
+            ax = self.fig.add_subplot(grid[2, :])
+            width = 0.8 / len(names)
+            series = {}
+            for j, name in enumerate(names):
+                xs = [i - 0.4 + width * (j + 0.5) for i in range(len(self.OUTCOMES))]
+                series[name] = list(ax.bar(xs, [0] * len(xs), width=width, label=name))
+            ax.set_xticks(range(len(self.OUTCOMES))); ax.set_xticklabels([str(o) for o in self.OUTCOMES])
+            ax.set_title("Guess Distribution"); ax.set_ylabel("Games")
+            ax.legend(fontsize=8, ncol=len(names))
+            self.hist = (ax, series)
+
+        self.fig.suptitle('Metrics', fontsize=14)
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def update_charts(self, title, stats_by_name):
+        """Moves bars/labels to the given stats ({name: stats}; key None for a single run)."""
+        self.fig.suptitle(title, fontsize=14)
+        for ax, entries in self.charts:
+            top = 0
+            for rect, label, name, key in entries:
+                stats = stats_by_name.get(name)
+                v = stats[key] if stats else 0
+                rect.set_height(v)
+                label.set_y(v); label.set_text(f'{v:.1f}' if stats else '')
+                top = max(top, v)
+            ax.set_ylim(0, top * 1.15 or 1)
+        if self.hist:
+            ax, series = self.hist
+            top = 0
+            for name, rects in series.items():
+                counts = stats_by_name[name]["outcomes"] if stats_by_name.get(name) else {}
+                for rect, outcome in zip(rects, self.OUTCOMES):
+                    rect.set_height(counts.get(outcome, 0))
+                    top = max(top, counts.get(outcome, 0))
+            ax.set_ylim(0, top * 1.15 or 1)
+        self.canvas.draw_idle()
+
+    def read_num_games(self):
+        try:
+            return max(1, int(self.games_var.get()))
+        except ValueError:
+            return 10
+
+    def start_run(self, bench, total, text):
+        self.bench = bench
+        self.insight_lbl.config(text=text)
+        self.profile_lbl.config(text="")
+        self.trace_btn.config(state=tk.DISABLED)
+        self.start_btn.config(state=tk.DISABLED)
+        self.compare_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.progress.config(maximum=total, value=0)
+        self.poll_events()
 
     def run_benchmark(self):
+        if self.bench is not None: return
         algo_name = self.algo_combobox.get()
-        self.config(cursor="wait")
-        self.insight_lbl.config(text=f"Running simulation for {algo_name}... Please wait...")
-        self.update()
+        num_games = self.read_num_games()
+        self.build_charts(None)
         
         solver_class = self.solver_classes[algo_name]
-        bench = PerformanceBenchmark(self.word_list, solver_class, num_games=10)
-        
+        profile = self.profile_var.get()
+        bench = PerformanceBenchmark(self.word_list, solver_class, num_games=num_games,
+                                     pattern_table=self.pattern_table, seed=Config.BENCHMARK_SEED,
+                                     profile=profile, trace=profile)
+        self.profiler = bench.profiler
+        events = self.events
+        last_push = [0.0]
+
+        def on_progress(done, total):
+            # Snapshots are throttled: the Tk thread only ever needs the latest one
+            now = time.perf_counter()
+            if done == total or now - last_push[0] >= self.PUSH_INTERVAL:
+                last_push[0] = now
+                events.put(("progress", algo_name, done, total, bench.calculate_stats()))
+
         def task():
-            stats = bench.run()
-            if self.winfo_exists():
-                self.after(0, lambda: self.show_results(algo_name, stats))
+            stats = bench.run(progress_callback=on_progress)
+            events.put(("done", algo_name, bench.cancelled.is_set(), stats))
         
         threading.Thread(target=task, daemon=True).start()
+        self.start_run(bench, num_games, f"Running simulation for {algo_name}... Please wait...")
+
+    def run_comparison(self):
+        """Every solver at once, one process each, on the secrets a single run would use."""
+        if self.bench is not None: return
+        names = list(self.solver_classes)
+        num_games = self.read_num_games()
+        self.build_charts(names)
+        self.partial = {}
+        self.profiler = None
+
+        secrets = list(secret_stream(self.word_list, num_games, random.Random(Config.BENCHMARK_SEED)))
+        comparison = SolverComparison(self.word_list, self.solver_classes, secrets, self.pattern_table,
+                                      profile=self.profile_var.get())
+        events = self.events
 
-    def show_results(self, algo_name, stats):
-        self.config(cursor="")
+        def on_progress(name, done, total, stats):
+            events.put(("solver", name, done, total, stats))
+
+        def task():
+            results = comparison.run(on_progress)
+            events.put(("compared", comparison.cancelled.is_set(), results))
+
+        threading.Thread(target=task, daemon=True).start()
+        self.start_run(comparison, num_games * len(names),
+                       f"Comparing {', '.join(names)} on {num_games} games... Please wait...")
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Export Chrome Trace", defaultextension=".json",
+                                            initialfile="trace.json", filetypes=[("Trace JSON", "*.json")])
+        if path and self.profiler is not None:
+            self.profiler.write_trace(path)
+
+    def cancel_benchmark(self):
+        if self.bench is not None:
+            self.bench.cancel()
+            self.cancel_btn.config(state=tk.DISABLED)
+
+    def poll_events(self):
+        """Drains the worker's queue; only the newest progress per run/solver is drawn."""
+        latest = finished = None
+        solvers = {}
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress": latest = event
+            elif event[0] == "solver": solvers[event[1]] = event
+            else: finished = event
+
+        if latest:
+            self.show_partial(*latest[1:])
+        if solvers:
+            for _, name, done, total, stats in solvers.values():
+                self.partial[name] = (done, stats)
+            self.show_comparison(total)
+        if finished:
+            self.bench = None
+            self.poll_id = None
+            self.start_btn.config(state=tk.NORMAL)
+            self.compare_btn.config(state=tk.NORMAL)
+            self.cancel_btn.config(state=tk.DISABLED)
+            if finished[0] == "done":
+                _, algo_name, cancelled, stats = finished
+                self.show_results(algo_name, stats, cancelled)
+            else:
+                _, cancelled, results = finished
+                self.show_comparison_results(results, cancelled)
+            return
+        self.poll_id = self.after(Config.DASHBOARD_POLL_MS, self.poll_events)
+
+    def close(self):
+        if self.bench is not None: self.bench.cancel()
+        if self.poll_id is not None: self.after_cancel(self.poll_id)
+        if plt is not None and hasattr(self, "fig"): plt.close(self.fig)
+        self.destroy()
+
+    def show_partial(self, algo_name, done, total, stats):
+        self.progress.config(value=done)
         if not stats: return
+        self.insight_lbl.config(text=f"Running simulation for {algo_name}... {done}/{total} games\n"
+                                     f"So far: avg guesses {stats['avg_guesses']:.2f} | win rate {stats['win_rate']:.1f}% | "
+                                     f"avg time {stats['avg_time']:.0f} µs")
+        self.update_charts(f'{algo_name} Metrics ({done}/{total} games)', {None: stats})
+
+    def show_comparison(self, total):
+        self.progress.config(value=sum(done for done, _ in self.partial.values()))
+        lines = [f"{name:8} {done}/{total} games | avg guesses {stats['avg_guesses']:.2f} | "
+                 f"win rate {stats['win_rate']:.1f}%" for name, (done, stats) in self.partial.items() if stats]
+        self.insight_lbl.config(text="Comparing solvers...\n" + "\n".join(lines))
+        self.update_charts(f'Solver Comparison ({total} games each)',
+                           {name: stats for name, (_, stats) in self.partial.items()})
+
+    def show_results(self, algo_name, stats, cancelled=False):
+        if not stats:
+            self.insight_lbl.config(text=f"{algo_name}: cancelled before the first game finished.")
+            return
         
         # Text Analytics
-        insight = f"--- PERFORMANCE REPORT: {algo_name} ---\n"
+        status = f" (cancelled after {stats['games']} games)" if cancelled else ""
+        insight = f"--- PERFORMANCE REPORT: {algo_name}{status} ---\n"
         insight += f"TIME (µs): Avg {stats['avg_time']:.2f} | Peak {stats['max_time']:.2f}\n"
+        insight += f"PER TURN (µs): solve_step Avg {stats['avg_solve']:.2f} | p95 {stats['p95_solve']:.2f}"
+        insight += f" — filter_candidates Avg {stats['avg_filter']:.2f} | p95 {stats['p95_filter']:.2f}\n"
         insight += f"MEMORY (B): Avg {stats['avg_mem']:.2f} | Peak {stats['max_mem']:.2f}\n"
         insight += f"NODES: Avg {stats['avg_nodes']:.1f} | Peak {stats['max_nodes']}\n"
         insight += f"GUESSES: Avg {stats['avg_guesses']:.1f} | Peak {stats['max_guesses']}"
         self.insight_lbl.config(text=insight)
+        if "profile" in stats:
+            self.profile_lbl.config(text="\n".join(format_summary(stats["profile"])))
+            self.trace_btn.config(state=tk.NORMAL)
 
-        # Charts
-        for widget in self.chart_frame.winfo_children(): widget.destroy()
-        
-        fig, axs = plt.subplots(2, 2, figsize=(10, 6))
-        fig.suptitle(f'{algo_name} Metrics', fontsize=14)
-        
-        def draw(ax, title, avg, peak, unit, cols):
-            ax.bar(['Avg', 'Peak'], [avg, peak], color=cols)
-            ax.set_title(title); ax.set_ylabel(unit)
-            for i, v in enumerate([avg, peak]): ax.text(i, v, f'{v:.1f}', ha='center', va='bottom')
+        self.update_charts(f'{algo_name} Metrics ({stats["games"]} games)', {None: stats})
 
-        draw(axs[0,0], "Time", stats['avg_time'], stats['max_time'], "µs", ['#3498db', '#2980b9'])
-        draw(axs[0,1], "Memory", stats['avg_mem'], stats['max_mem'], "Bytes", ['#9b59b6', '#8e44ad'])
-        draw(axs[1,0], "Nodes", stats['avg_nodes'], stats['max_nodes'], "Count", ['#e67e22', '#d35400'])
-        draw(axs[1,1], "Guesses", stats['avg_guesses'], stats['max_guesses'], "Count", ['#2ecc71', '#27ae60'])
-        
-        plt.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
\ No newline at end of file
+    @staticmethod
+    def profile_lines(results):
+        """One line per profiled solver: mean phase times and per-game counters."""
+        lines = []
+        for name, stats in results.items():
+            if not stats or "profile" not in stats: continue
+            phases, counters = stats["profile"]["phases"], stats["profile"]["counters"]
+            mean = lambda phase: phases[phase]["mean_us"] if phase in phases else 0.0
+            per_game = lambda counter: counters.get(counter, 0) / stats["games"]
+            lines.append(f"{name:10} solve {mean('solve_step'):9.1f} µs  filter {mean('filter_candidates'):8.1f} µs  "
+                         f"feedback/game {per_game('feedback_evals'):11.0f}  "
+                         f"scanned/game {per_game('candidates_scanned'):9.0f}")
+        return lines
+
+    def show_comparison_results(self, results, cancelled=False):
+        status = " (cancelled)" if cancelled else ""
+        insight = f"--- COMPARISON REPORT{status} ---\n"
+        for name, stats in results.items():
+            if not stats:
+                insight += f"{name:8} no games finished\n"
+                continue
+            insight += (f"{name:8} GUESSES Avg {stats['avg_guesses']:.2f} | WIN {stats['win_rate']:.1f}% | "
+                        f"TIME Avg {stats['avg_time']:.0f} µs | NODES Avg {stats['avg_nodes']:.1f} | "
+                        f"MEMORY Peak {stats['max_mem']:.0f} B ({stats['games']} games)\n")
+        self.insight_lbl.config(text=insight.rstrip())
+        self.profile_lbl.config(text="\n".join(self.profile_lines(results)))
+
+        games = max((stats["games"] for stats in results.values() if stats), default=0)
+        self.update_charts(f'Solver Comparison ({games} games each)', results)
@@ -1,17 +1,24 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
+import time
 import threading
 import datetime
 import sys
 import random
+import collections
 
 from config import Config
-from utils import load_words
-from game import WordleGame
-from solvers import BFSSolver, DFSSolver, UCSSolver, AStarSolver
+from utils import load_words, load_guesses
+from game import WordleGame, hard_mode_violation
+from patterns import PatternTable, HAS_NUMPY
+from constraints import ConstraintIndex
+from solvers import AStarSolver, SOLVER_REGISTRY
+from opening_book import OpeningBook
 
 # Import our new modular dialogs
 from .dialogs import ResultsDialog, HintDialog, BenchmarkDialog
+from .solver_worker import SolverWorker
+from .analysis_worker import AnalysisWorker
 
 class WordleGUI:
     def __init__(self, root):
@@ -25,26 +32,49 @@ class WordleGUI:
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.word_list = load_words()
-        self.game = WordleGame(self.word_list)
+        self.guess_list = load_guesses(self.word_list)
+        # Shared feedback table, memory-mapped from the on-disk cache
+        self.pattern_table = PatternTable.load(self.word_list, self.guess_list) if HAS_NUMPY else None
+        self.constraint_index = ConstraintIndex(self.word_list) if self.pattern_table is None else None
+        self.game = WordleGame(self.word_list, self.pattern_table, self.constraint_index, guess_list=self.guess_list)
         
-        self.solvers = {
-            "BFS": BFSSolver, 
-            "DFS": DFSSolver, 
-            "UCS": UCSSolver, 
-            "A*": AStarSolver
-        }
+        self.solvers = {name: cls for name, cls in SOLVER_REGISTRY.items()
+                        if self.pattern_table is not None or not cls.REQUIRES_TABLE}
+        self.opening_books = {}  # (solver class, hard mode) -> OpeningBook or None
         # Default solver instance
         self.current_solver_instance = AStarSolver(self.game) 
+        # Solving and filtering run on this worker, never in a Tk callback
+        self.worker = SolverWorker()
+        self.pending_guess = None  # (guess, report, count) waiting for its turn on screen
+        self.next_guess_at = 0.0   # perf_counter time the next AI guess may be shown
+        self.poll_id = None
+        # Candidate count and ranked next guesses for the side panel
+        self.analysis = AnalysisWorker()
         
         self.is_auto_playing = False
+        # Turbo: the worker plays whole games back to back on its own game
+        self.is_turbo = False
+        self.turbo_id = None
+        self.turbo_stats = None
+        # Widget changes are queued and applied once per frame (render_frame)
+        self.pending_config = {}  # widget -> options to apply at the next frame
+        self.applied_config = {}  # widget -> options as last applied
+        self.log_lines = collections.deque(maxlen=Config.LOG_MAX_LINES)  # (timestamp, line, tags) not yet shown
+        self.log_cleared = False
+        self.frame_id = None
+        self.key_colors = {}  # char -> key background, so recolouring never reads the widget
         self.key_map = {} 
         self.guesses = [] 
         
         self.setup_ui()
         self.start_new_game()
+        self.poll_analysis()
 
     def on_close(self):
         self.is_auto_playing = False
+        self.is_turbo = False
+        self.worker.stop()
+        self.analysis.stop()
         self.root.destroy()
         sys.exit(0)
 
@@ -69,7 +99,7 @@ class WordleGUI:
         self.cells = []
         for row in range(6):
             row_cells = []
-            for col in range(5):
+            for col in range(self.game.word_length):
                 lbl = tk.Label(self.grid_frame, text="", width=4, height=2,
                                font=Config.FONT_GRID,
                                bg=Config.COLOR_BG, fg=Config.COLOR_TEXT,
@@ -105,17 +135,28 @@ class WordleGUI:
         ttk.Separator(btn_row, orient='vertical').pack(side=tk.LEFT, fill='y', padx=10)
 
         self.algo_var = tk.StringVar(value="A*")
-        for mode in ["BFS", "DFS", "UCS", "A*"]:
+        for mode in self.solvers:
             tk.Radiobutton(btn_row, text=mode, variable=self.algo_var, value=mode,
                            bg=Config.COLOR_BG, fg=Config.COLOR_TEXT, selectcolor=Config.COLOR_BG,
                            activebackground=Config.COLOR_BG, activeforeground=Config.COLOR_TEXT,
                            font=("Arial", 10), command=self.switch_solver).pack(side=tk.LEFT, padx=2)
 
+        # Takes effect at the next new game
+        self.hard_var = tk.BooleanVar(value=Config.HARD_MODE)
+        tk.Checkbutton(btn_row, text="Hard", variable=self.hard_var,
+                       bg=Config.COLOR_BG, fg=Config.COLOR_TEXT, selectcolor=Config.COLOR_BG,
+                       activebackground=Config.COLOR_BG, activeforeground=Config.COLOR_TEXT,
+                       font=("Arial", 10)).pack(side=tk.LEFT, padx=2)
+
         # --- FIX IS HERE: Assigning to self.btn_solve ---
         self.btn_solve = tk.Button(btn_row, text="▶ Auto solve", command=self.start_auto_solve,
                                    bg=Config.COLOR_PRESENT, fg="white", font=("Arial", 10, "bold"))
         self.btn_solve.pack(side=tk.LEFT, padx=10)
 
+        self.btn_turbo = tk.Button(btn_row, text="⚡ Turbo", command=self.toggle_turbo,
+                                   bg="#8e44ad", fg="white", font=("Arial", 10, "bold"))
+        self.btn_turbo.pack(side=tk.LEFT, padx=2)
+
         tk.Button(btn_row, text="💡 Hint", command=self.give_hint,
                   bg="#f1c40f", fg="black", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=2)
 
@@ -131,8 +172,21 @@ class WordleGUI:
         right_container = tk.Frame(self.root, bg=Config.COLOR_LOG_BG, width=320)
         right_container.grid(row=0, column=1, sticky="ns", padx=(0, 20), pady=20)
         right_container.pack_propagate(False) 
+        self.setup_analysis_area(right_container)
         self.setup_log_area(right_container)
 
+    def setup_analysis_area(self, parent_frame):
+        tk.Label(parent_frame, text="ANALYSIS", font=("Arial", 11, "bold"),
+                 bg=Config.COLOR_LOG_BG, fg=Config.COLOR_LOG_TEXT, pady=10).pack(fill="x")
+        self.analysis_status = tk.StringVar(value="")
+        tk.Label(parent_frame, textvariable=self.analysis_status, font=Config.FONT_LOG, anchor="w",
+                 bg=Config.COLOR_LOG_BG, fg=Config.COLOR_LOG_TEXT).pack(fill="x", padx=10)
+        self.analysis_top = tk.StringVar(value="")
+        tk.Label(parent_frame, textvariable=self.analysis_top, font=Config.FONT_LOG, anchor="nw", justify="left",
+                 height=Config.ANALYSIS_TOP_K, bg=Config.COLOR_LOG_BG,
+                 fg=Config.COLOR_LOG_TEXT).pack(fill="x", padx=10, pady=(5, 0))
+        ttk.Separator(parent_frame, orient='horizontal').pack(fill='x', pady=10)
+
     def setup_log_area(self, parent_frame):
         tk.Label(parent_frame, text="GAME LOGS", font=("Arial", 11, "bold"), 
                  bg=Config.COLOR_LOG_BG, fg=Config.COLOR_LOG_TEXT, pady=10).pack(fill="x")
@@ -155,13 +209,60 @@ class WordleGUI:
         self.log_text.tag_configure("hint", foreground="#d35400", font=(Config.FONT_LOG[0], Config.FONT_LOG[1], "bold"))
 
     def log_message(self, message, tags=None):
-        self.log_text.config(state="normal")
+        """Queues a log line; render_frame writes the queued lines in one insert."""
         timestamp = datetime.datetime.now().strftime("[%H:%M:%S] ")
-        self.log_text.insert("end", timestamp)
-        self.log_text.insert("end", message + "\n", tags)
+        self.log_lines.append((timestamp, message + "\n", tags or ()))
+        self.request_frame()
+
+    def clear_log(self):
+        self.log_lines.clear()
+        self.log_cleared = True
+        self.request_frame()
+
+    def flush_log(self):
+        if not self.log_lines and not self.log_cleared: return
+        chunks = []
+        for timestamp, line, tags in self.log_lines:
+            chunks += [timestamp, (), line, tags]
+        self.log_lines.clear()
+        self.log_text.config(state="normal")
+        if self.log_cleared:
+            self.log_text.delete("1.0", "end")
+            self.log_cleared = False
+        if chunks:
+            self.log_text.insert("end", *chunks)
+        # The widget keeps the newest LOG_MAX_LINES lines, like the pending queue
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - Config.LOG_MAX_LINES
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
         self.log_text.see("end")
         self.log_text.config(state="disabled")
 
+    # --- RENDERING ---
+    def set_widget(self, widget, **options):
+        """Queues widget.config(**options) for the next frame; later calls win."""
+        self.pending_config.setdefault(widget, {}).update(options)
+        self.request_frame()
+
+    def request_frame(self):
+        if self.frame_id is None:
+            self.frame_id = self.root.after(Config.FRAME_MS, self.render_frame)
+
+    def render_frame(self):
+        """Applies the queued widget options that differ from what is shown, then the log."""
+        self.frame_id = None
+        try:
+            if not self.root.winfo_exists(): return
+        except tk.TclError: return
+        pending, self.pending_config = self.pending_config, {}
+        for widget, options in pending.items():
+            applied = self.applied_config.setdefault(widget, {})
+            changed = {key: value for key, value in options.items() if applied.get(key) != value}
+            if changed:
+                widget.config(**changed)
+                applied.update(changed)
+        self.flush_log()
+
     def create_keyboard(self):
         container = tk.Frame(self.keyboard_frame, bg=Config.COLOR_BG)
         container.pack()
@@ -178,8 +279,7 @@ class WordleGUI:
 
     def update_keyboard_color(self, char, status):
         if char not in self.key_map: return
-        widget = self.key_map[char]
-        current_bg = widget.cget("bg")
+        current_bg = self.key_colors.get(char, Config.COLOR_KEY_DEFAULT)
         
         new_color = Config.COLOR_KEY_DEFAULT
         text_color = Config.COLOR_TEXT 
@@ -195,23 +295,36 @@ class WordleGUI:
                 new_color = Config.COLOR_ABSENT; text_color = "white"
             else: new_color = current_bg; text_color = "white"
                 
-        widget.config(bg=new_color, fg=text_color)
+        self.key_colors[char] = new_color
+        self.set_widget(self.key_map[char], bg=new_color, fg=text_color)
+
+    def clear_board(self):
+        for row in range(6):
+            for col in range(self.game.word_length):
+                self.set_widget(self.cells[row][col], text="", bg=Config.COLOR_EMPTY, fg=Config.COLOR_TEXT,
+                                highlightthickness=1)
+        self.key_colors.clear()
+        for widget in self.key_map.values():
+            self.set_widget(widget, bg=Config.COLOR_KEY_DEFAULT, fg=Config.COLOR_TEXT)
+
+    def paint_row(self, row, guess, feedback):
+        for i, (char, status) in enumerate(zip(guess, feedback)):
+            color = Config.COLOR_CORRECT if status==2 else Config.COLOR_PRESENT if status==1 else Config.COLOR_ABSENT
+            self.set_widget(self.cells[row][i], text=char.upper(), bg=color, fg="white", highlightthickness=0)
+            self.update_keyboard_color(char, status)
 
     # --- GAMEPLAY ---
     def start_new_game(self):
+        self.game.hard_mode = self.hard_var.get()
         self.game.reset_game()
+        self.analysis.reset(self.game)
         self.current_row = 0
         self.guesses = []
         self.entry_var.set("")
         self.status_var.set("New Game Started")
         
-        for row in range(6):
-            for col in range(5):
-                self.cells[row][col].config(text="", bg=Config.COLOR_EMPTY, fg=Config.COLOR_TEXT, highlightthickness=1)
-        for char, widget in self.key_map.items(): 
-            widget.config(bg=Config.COLOR_KEY_DEFAULT, fg=Config.COLOR_TEXT)
-            
-        self.log_text.config(state="normal"); self.log_text.delete(1.0, "end"); self.log_text.config(state="disabled")
+        self.clear_board()
+        self.clear_log()
         self.log_message("--- NEW GAME STARTED ---", "bold")
         self.is_auto_playing = False
         
@@ -221,28 +334,49 @@ class WordleGUI:
         self.entry.focus_set()
         self.switch_solver()
 
+    def opening_book(self, solver_class, hard_mode):
+        book_key = (solver_class, hard_mode)
+        if book_key not in self.opening_books:
+            self.opening_books[book_key] = OpeningBook.load(solver_class, self.word_list, hard_mode=hard_mode,
+                                                            guess_list=self.guess_list)
+        return self.opening_books[book_key]
+
     def switch_solver(self):
-        algo_name = self.algo_var.get()
-        self.current_solver_instance = self.solvers[algo_name](self.game)
-        self.current_solver_instance.reset()
+        solver_class = self.solvers[self.algo_var.get()]
+        if self.is_turbo:
+            return self.launch_turbo()
+        self.current_solver_instance = solver_class(self.game)
+        self.current_solver_instance.opening_book = self.opening_book(solver_class, self.game.hard_mode)
+        self.pending_guess = None
+        self.worker.reset(self.current_solver_instance)
+        # A solver picked mid-game catches up on the guesses already played
+        for guess in self.guesses:
+            self.worker.feedback(guess, self.game.check_guess(guess))
+        # The new epoch dropped the guess auto-solve was waiting for
+        if self.is_auto_playing and not self.game.game_over:
+            self.worker.request_guess(Config.AUTO_STEP_BUDGET_MS)
 
     def process_player_guess(self):
-        if self.game.game_over or self.is_auto_playing: return
+        if self.game.game_over or self.is_auto_playing or self.is_turbo: return
         guess = self.entry_var.get().strip().lower()
-        if len(guess) != 5: return messagebox.showwarning("Invalid", "Word must be 5 letters.")
+        length = self.game.word_length
+        if len(guess) != length: return messagebox.showwarning("Invalid", f"Word must be {length} letters.")
         if not self.game.is_valid_word(guess): return messagebox.showwarning("Invalid", "Not in dictionary.")
+        if self.game.hard_mode:
+            violation = hard_mode_violation(guess, [(g, self.game.check_guess(g)) for g in self.guesses])
+            if violation: return messagebox.showwarning("Hard mode", violation)
         
         self.log_message(f"Player guessed: {guess.upper()}")
         self.submit_guess(guess)
         self.entry_var.set("")
 
     def give_hint(self):
-        if self.game.game_over: return
+        if self.game.game_over or self.is_turbo: return
         target = self.game.secret_word
         hint_char, hint_idx = "", -1
         
         if not self.guesses:
-            hint_idx = random.randint(0, 4)
+            hint_idx = random.randrange(self.game.word_length)
             hint_char = target[hint_idx]
         else:
             last_guess = self.guesses[-1]
@@ -255,56 +389,80 @@ class WordleGUI:
                 hint_char = char
             else:
                 green_indices = [i for i, s in enumerate(feedback) if s == 2]
-                hidden = [i for i in range(5) if i not in green_indices]
+                hidden = [i for i in range(self.game.word_length) if i not in green_indices]
                 if hidden:
                     hint_idx = random.choice(hidden)
                     hint_char = target[hint_idx]
         
-        if hint_char: HintDialog(self.root, hint_char, hint_idx)
+        if hint_char: HintDialog(self.root, hint_char, hint_idx, self.game.word_length)
 
     def start_auto_solve(self):
-        if self.game.game_over: return
+        if self.game.game_over or self.is_turbo: return
         self.is_auto_playing = True
         self.entry.config(state="disabled")
         self.btn_solve.config(state="disabled")
         algo = self.algo_var.get()
+        self.analysis.cancel()
         self.log_message(f"--- AI ({algo}) Taking Over ---", "bold")
+        self.log_message("AI thinking...")
+        self.next_guess_at = time.perf_counter()
+        self.worker.request_guess(Config.AUTO_STEP_BUDGET_MS)
+        if self.poll_id is not None: self.root.after_cancel(self.poll_id)
         self.run_auto_step()
 
     def run_auto_step(self):
+        """
+        Polls the solver worker. Its next guess is computed while the last
+        one is on screen, and shown once AUTO_STEP_DELAY_MS have passed.
+        """
+        self.poll_id = None
         try:
             if not self.root.winfo_exists(): return
         except tk.TclError: return
-        if self.game.game_over: return 
-        
-        solver = self.current_solver_instance
-        count = len(solver.candidates)
-        self.log_message(f"AI thinking... ({count} candidates)")
-        guess = solver.solve_step()
-        
-        if guess:
-            self.log_message(f"AI guesses: {guess.upper()}", "bold")
+        if self.game.game_over or not self.is_auto_playing: return
+
+        if self.pending_guess is None:
+            self.pending_guess = self.worker.poll()
+        if self.pending_guess is not None and time.perf_counter() >= self.next_guess_at:
+            (guess, report, count), self.pending_guess = self.pending_guess, None
+            if not guess:
+                self.log_message("AI Failed: No candidates.", "yellow")
+                self.is_auto_playing = False; self.btn_solve.config(state="normal")
+                return
+            self.log_message(f"AI guesses: {guess.upper()} of {count} candidates ({self.describe_search(report)})",
+                             "bold")
             self.submit_guess(guess)
-            if not self.game.game_over: self.root.after(1000, self.run_auto_step)
+            self.next_guess_at = time.perf_counter() + Config.AUTO_STEP_DELAY_MS / 1000
+            if self.game.game_over: return
+        self.poll_id = self.root.after(Config.SOLVER_POLL_MS, self.run_auto_step)
+
+    @staticmethod
+    def describe_search(report):
+        if report.get("book"):
+            return "opening book"
+        if "scored" in report:
+            reach = f"{report['scored']}/{report['of']} guesses scored"
         else:
-            self.log_message("AI Failed: No candidates.", "yellow")
-            self.is_auto_playing = False; self.btn_solve.config(state="normal")
+            reach = f"depth {report['depth']}"
+        state = "" if report["complete"] else ", cut off"
+        return f"{reach}{state}, {report['elapsed_ms']:.0f} ms"
 
     def submit_guess(self, guess):
         self.guesses.append(guess)
-        for i, char in enumerate(guess): self.cells[self.current_row][i].config(text=char.upper())
         feedback = self.game.check_guess(guess)
         log_fb = ["🟩" if s==2 else "🟨" if s==1 else "⬛" for s in feedback]
         self.log_message(f"Feedback: {''.join(log_fb)}")
+        self.paint_row(self.current_row, guess, feedback)
+
+        # The worker filters the candidates and, while auto-playing, goes on
+        # to search the next guess during the step delay
+        won = all(f == 2 for f in feedback)
+        more = self.is_auto_playing and not won and self.current_row < 5
+        self.worker.feedback(guess, feedback, Config.AUTO_STEP_BUDGET_MS if more else None)
+        # The panel ranks next guesses for the player only; the AI logs its own
+        self.analysis.feedback(guess, feedback, rank=not self.is_auto_playing and not won and self.current_row < 5)
         
-        for i, status in enumerate(feedback):
-            color = Config.COLOR_CORRECT if status==2 else Config.COLOR_PRESENT if status==1 else Config.COLOR_ABSENT
-            self.cells[self.current_row][i].config(bg=color, fg="white", highlightthickness=0)
-            self.update_keyboard_color(guess[i], status)
-            
-        self.current_solver_instance.filter_candidates(guess, feedback)
-        
-        if all(f == 2 for f in feedback):
+        if won:
             self.game.game_over = True; self.status_var.set("Victory!")
             self.log_message(">>> GAME WON! <<<", "green")
             self.root.after(500, lambda: self.show_results_popup(True))
@@ -314,8 +472,88 @@ class WordleGUI:
             self.root.after(500, lambda: self.show_results_popup(False))
         else: self.current_row += 1
 
+    # --- TURBO ---
+    def toggle_turbo(self):
+        if self.is_turbo: self.stop_turbo()
+        else: self.start_turbo()
+
+    def start_turbo(self):
+        """Auto-plays new games back to back at full speed until stopped."""
+        self.is_auto_playing = False
+        if self.poll_id is not None: self.root.after_cancel(self.poll_id); self.poll_id = None
+        self.pending_guess = None
+        self.is_turbo = True
+        self.turbo_stats = {"games": 0, "wins": 0, "guesses": 0, "start": time.perf_counter()}
+        self.btn_turbo.config(text="■ Stop turbo")
+        for widget in (self.entry, self.btn_guess, self.btn_solve): widget.config(state="disabled")
+        self.analysis.cancel()
+        self.clear_log()
+        self.launch_turbo()
+        self.run_turbo_frame()
+
+    def launch_turbo(self):
+        """Hands the worker a fresh game and solver; also restarts turbo after a solver switch."""
+        algo = self.algo_var.get()
+        solver_class = self.solvers[algo]
+        game = WordleGame(self.word_list, self.pattern_table, self.constraint_index, self.hard_var.get(),
+                          self.guess_list)
+        solver = solver_class(game)
+        solver.opening_book = self.opening_book(solver_class, game.hard_mode)
+        self.worker.turbo(solver, Config.AUTO_STEP_BUDGET_MS)
+        self.log_message(f"--- TURBO ({algo}{', hard' if game.hard_mode else ''}) ---", "bold")
+
+    def run_turbo_frame(self):
+        """Once per frame: logs the games finished since the last frame and shows the newest one."""
+        self.turbo_id = None
+        try:
+            if not self.root.winfo_exists(): return
+        except tk.TclError: return
+        if not self.is_turbo: return
+        games = self.worker.drain()
+        stats = self.turbo_stats
+        for secret, guesses, feedbacks, won in games:
+            stats["games"] += 1; stats["wins"] += won; stats["guesses"] += len(guesses)
+            self.log_message(f"#{stats['games']} {secret.upper()}: {' '.join(guesses).upper()}",
+                             "green" if won else "yellow")
+        if games:
+            # Only the last game of the frame reaches the board; render_frame skips unchanged cells
+            secret, guesses, feedbacks, won = games[-1]
+            self.clear_board()
+            for row, (guess, feedback) in enumerate(zip(guesses, feedbacks)):
+                self.paint_row(row, guess, feedback)
+            elapsed = time.perf_counter() - stats["start"]
+            self.status_var.set(f"Turbo: {stats['games']} games · {100 * stats['wins'] / stats['games']:.1f}% won · "
+                                f"{stats['guesses'] / stats['games']:.3f} avg · "
+                                f"{60 * stats['games'] / max(elapsed, 1e-9):.0f} games/min")
+        self.turbo_id = self.root.after(Config.FRAME_MS, self.run_turbo_frame)
+
+    def stop_turbo(self):
+        self.is_turbo = False
+        if self.turbo_id is not None: self.root.after_cancel(self.turbo_id); self.turbo_id = None
+        self.btn_turbo.config(text="⚡ Turbo")
+        self.btn_guess.config(state="normal")
+        self.start_new_game()  # a new epoch, which also ends the worker's game loop
+
+    def poll_analysis(self):
+        """Shows the analysis worker's newest result; runs for the window's lifetime."""
+        try:
+            if not self.root.winfo_exists(): return
+        except tk.TclError: return
+        result = self.analysis.poll()
+        if result is not None:
+            count, scanned, total, top, complete = result
+            status = f"{count} candidate{'s' if count != 1 else ''} left"
+            if not complete:
+                status += f" · ranking {scanned}/{total}" if total else " · ranking..."
+            self.analysis_status.set(status)
+            lines = [f"{i}. {guess.upper():<{self.game.word_length}}  {expected:8.2f} left"
+                     for i, (guess, expected) in enumerate(top, 1)]
+            if lines or complete or not scanned:  # a new position clears the old list
+                self.analysis_top.set("\n".join(lines))
+        self.root.after(Config.SOLVER_POLL_MS, self.poll_analysis)
+
     def show_results_popup(self, won):
         ResultsDialog(self.root, won, self.game.secret_word, self.start_new_game, self.on_close)
 
     def open_benchmark_window(self):
-        BenchmarkDialog(self.root, self.word_list, self.solvers)
\ No newline at end of file
+        BenchmarkDialog(self.root, self.word_list, self.solvers, self.pattern_table)
\ No newline at end of file
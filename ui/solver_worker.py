@@ -0,0 +1,123 @@
+# Runs the GUI's solver off the Tk thread
+import time
+import queue
+import threading
+from benchmark import MAX_ATTEMPTS
+
+
+class SolverWorker:
+    """
+    Owns the current solver on a daemon thread.
+
+    The Tk thread only sends commands (a new solver, the feedback of a
+    guess, a request for the next guess) and drains `results`; it never
+    calls solve_step or filter_candidates itself. Feedback may ask for the
+    next guess straight away, so the worker searches while the previous
+    guess is still being shown.
+
+    A thread rather than a process: the slow solvers spend their time in
+    numpy (bincount, sort, fancy indexing), which releases the GIL, and the
+    rest take microseconds, so the Tk loop keeps running while they work.
+
+    Every new game or solver starts a new epoch; commands and results of an
+    older epoch are dropped, so a late guess never lands in the next game.
+
+    In turbo mode the worker plays whole games back to back on its own game
+    object and posts one record per game to `games`, until any new command
+    arrives.
+    """
+    def __init__(self):
+        self.inbox = queue.Queue()
+        self.results = queue.Queue()
+        self.games = queue.Queue()
+        self.epoch = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # --- Tk thread ---
+    def reset(self, solver):
+        """Makes `solver` (book attached, not yet reset) the worker's solver."""
+        self.epoch += 1
+        self.inbox.put(("reset", self.epoch, solver))
+
+    def feedback(self, guess, feedback, budget_ms=None):
+        """Filters the candidates; with a budget, then searches for the next guess."""
+        self.inbox.put(("feedback", self.epoch, guess, feedback, budget_ms))
+
+    def request_guess(self, budget_ms):
+        self.inbox.put(("solve", self.epoch, budget_ms))
+
+    def turbo(self, solver, budget_ms):
+        """Plays games with `solver` (book attached, own game) until the next command."""
+        self.epoch += 1
+        self.inbox.put(("turbo", self.epoch, solver, budget_ms))
+
+    def drain(self):
+        """(secret, guesses, feedbacks, won) of every turbo game finished since the last drain."""
+        games = []
+        while True:
+            try:
+                epoch, *record = self.games.get_nowait()
+            except queue.Empty:
+                return games
+            if epoch == self.epoch:
+                games.append(tuple(record))
+
+    def poll(self):
+        """(guess, report, candidate count) of the newest finished search, or None."""
+        latest = None
+        while True:
+            try:
+                epoch, *result = self.results.get_nowait()
+            except queue.Empty:
+                return latest
+            if epoch == self.epoch:
+                latest = tuple(result)
+
+    def stop(self):
+        self.inbox.put(None)
+
+    # --- Worker thread ---
+    def run(self):
+        solver = None
+        while True:
+            command = self.inbox.get()
+            if command is None:
+                return
+            kind, epoch = command[0], command[1]
+            if epoch != self.epoch:
+                continue
+            if kind == "reset":
+                solver = command[2]
+                solver.reset()
+                continue
+            if kind == "turbo":
+                self.play_games(command[2], command[3], epoch)
+                solver = None
+                continue
+            if kind == "feedback":
+                _, _, guess, feedback, budget_ms = command
+                solver.filter_candidates(guess, feedback)
+            else:
+                budget_ms = command[2]
+            if budget_ms is not None:
+                count = solver.candidate_count()
+                guess = solver.solve_step(deadline=time.perf_counter() + budget_ms / 1000)
+                self.results.put((epoch, guess, dict(solver.report), count))
+
+    def play_games(self, solver, budget_ms, epoch):
+        game = solver.game
+        while self.inbox.empty():
+            game.reset_game()
+            solver.reset()
+            guesses, feedbacks, won = [], [], False
+            while not won and len(guesses) < MAX_ATTEMPTS:
+                guess = solver.solve_step(deadline=time.perf_counter() + budget_ms / 1000)
+                if not guess:
+                    break
+                feedback = game.check_guess(guess)
+                solver.filter_candidates(guess, feedback)
+                guesses.append(guess)
+                feedbacks.append(feedback)
+                won = all(f == 2 for f in feedback)
+            self.games.put((epoch, game.secret_word, guesses, feedbacks, won))
@@ -1,15 +1,84 @@
 # utils.py
+import os
+import struct
+import hashlib
+from config import Config
+from wordbank import WordBank
 
-def load_words(filename="words.txt"):
-    """Loads valid 5-letter words from a text file."""
+# Precompiled dictionary: header + the WordBank buffer. The header records
+# the source file's size, mtime and digest so edits trigger a rebuild.
+DICT_MAGIC = b"WDICT01\0"
+DICT_HEADER = struct.Struct("<8sBqq20s")  # magic, word length, size, mtime_ns, sha1
+
+
+def parse_words(text, word_length=Config.WORD_LENGTH):
+    """Valid lower-case words of the given length, one per line."""
+    words = []
+    for line in text.split():
+        w = line.lower()
+        if len(w) == word_length and w.isascii() and w.isalpha():
+            words.append(w)
+    return words
+
+
+def words_file(word_length=Config.WORD_LENGTH):
+    """The per-length word list (Config.WORDS_FILE_PATTERN) if there is one, else Config.WORDS_FILE."""
+    path = Config.WORDS_FILE_PATTERN.format(length=word_length)
+    return path if os.path.exists(path) else Config.WORDS_FILE
+
+
+def guesses_file(word_length=Config.WORD_LENGTH):
+    """The per-length allowed-guess list, else Config.GUESSES_FILE, or None if neither exists."""
+    for path in (Config.GUESSES_FILE_PATTERN.format(length=word_length), Config.GUESSES_FILE):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_guesses(answers, filename=None, cache_dir=Config.CACHE_DIR):
+    """
+    The allowed-guess pool for `answers`: the answers themselves, followed
+    by the other words of the guess file (default guesses_file()). Answers
+    come first, so answer i is also guess i. Without a guess file the pool
+    is `answers` itself.
+    """
+    word_length = answers.word_length
+    if filename is None:
+        filename = guesses_file(word_length)
+    if filename is None or not os.path.exists(filename):
+        return answers
+    extra = [w for w in load_words(filename, word_length, cache_dir) if w not in answers]
+    return WordBank(list(answers) + extra, word_length) if extra else answers
+
+
+def load_words(filename=None, word_length=Config.WORD_LENGTH, cache_dir=Config.CACHE_DIR):
+    """
+    Loads the valid words of `word_length` letters from a text file (by
+    default words_file(word_length)) into a WordBank. A binary copy is
+    kept in `cache_dir` and read instead while the text file is unchanged.
+    """
+    if filename is None:
+        filename = words_file(word_length)
     try:
-        with open(filename, "r") as f:
-            print("loaded words.txt")
-            return [w.strip().lower() for w in f.readlines() if len(w.strip()) == 5 and w.strip().isalpha()]
-    except FileNotFoundError:
+        st = os.stat(filename)
+    except OSError:
+        st = None
+    if st is not None:
+        cache_path = os.path.join(cache_dir, f"{os.path.basename(filename)}.L{word_length}.bin")
+        cached = _read_dict_cache(cache_path, st, word_length)
+        if cached is not None:
+            return cached
+        with open(filename, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).digest()
+        cached = _read_dict_cache(cache_path, None, word_length, digest)
+        bank = cached if cached is not None else WordBank(parse_words(raw.decode("utf-8", "ignore"), word_length),
+                                                          word_length)
+        _write_dict_cache(cache_path, st, word_length, digest, bank)
+        return bank
+    else:
         # Default fallback list
-        print("cannot load words.txt")
-        return [
+        return WordBank([w for w in [
             "apple", "beach", "brain", "bread", "brush", "chair", "chest", "chord", 
             "click", "clock", "cloud", "dance", "diary", "drive", "drone", "eagle", 
             "earth", "feast", "field", "flame", "fruit", "glass", "grape", "green", 
@@ -20,4 +89,51 @@ def load_words(filename="words.txt"):
             "table", "tiger", "toast", "touch", "train", "truck", "voice", "watch", 
             "water", "whale", "white", "woman", "world", "write", "youth", "zebra", 
             "adieu", "tears", "alone", "arise", "stare", "hello", "media", "audit"
-        ]
\ No newline at end of file
+        ] if len(w) == word_length], word_length)
+
+
+def _read_dict_cache(path, st, word_length, digest=None):
+    """
+    The cached WordBank if it matches the source file: by size and mtime
+    when `st` is given, else by content digest (e.g. after a `touch`).
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, length, size, mtime_ns, stored_digest = DICT_HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    if magic != DICT_MAGIC or length != word_length:
+        return None
+    if st is not None and (size, mtime_ns) != (st.st_size, st.st_mtime_ns):
+        return None
+    if digest is not None and digest != stored_digest:
+        return None
+    return WordBank.from_buffer(data[DICT_HEADER.size:], word_length)
+
+
+def _write_dict_cache(path, st, word_length, digest, bank):
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(DICT_HEADER.pack(DICT_MAGIC, word_length, st.st_size, st.st_mtime_ns, digest))
+            f.write(bank.buffer)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass # a read-only checkout simply keeps parsing the text file
+
+def word_list_hash(words):
+    """Short stable digest of a word list, used to key on-disk caches."""
+    digest = hashlib.sha1()
+    digest.update(str(len(words[0]) if words else 0).encode("ascii"))
+    digest.update("\n".join(words).encode("ascii"))
+    return digest.hexdigest()[:16]
+
+
+def pools_hash(answers, guesses=None):
+    """word_list_hash of the answers, combined with the guesses' when they differ."""
+    if guesses is None or guesses == answers:
+        return word_list_hash(answers)
+    digest = hashlib.sha1(f"{word_list_hash(answers)}/{word_list_hash(guesses)}".encode("ascii"))
+    return digest.hexdigest()[:16]
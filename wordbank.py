@@ -0,0 +1,157 @@
+# wordbank.py
+from collections.abc import Sequence
+from config import Config
+
+# Numpy Check
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class WordBank(Sequence):
+    """
+    Immutable word list stored as one contiguous ASCII buffer.
+
+    Word i is buffer[i*L:(i+1)*L]. It behaves like a read-only list of str,
+    but solvers never copy it: candidate sets over a bank are index arrays
+    (all_ids) or bitsets (full_mask), so resetting a solver is O(1).
+    """
+    def __init__(self, words, word_length=None):
+        if not isinstance(words, (list, tuple)):
+            words = list(words)
+        if word_length is None:
+            word_length = len(words[0]) if words else Config.WORD_LENGTH
+        self.word_length = word_length
+        self.buffer = "".join(words).encode("ascii")
+        self._reset_caches()
+
+    @classmethod
+    def from_buffer(cls, buffer, word_length):
+        bank = cls.__new__(cls)
+        bank.word_length = word_length
+        bank.buffer = bytes(buffer)
+        bank._reset_caches()
+        return bank
+
+    @classmethod
+    def of(cls, words):
+        """`words` itself if it already is a WordBank, else a new bank."""
+        return words if isinstance(words, cls) else cls(words)
+
+    def _reset_caches(self):
+        self._text = None     # decoded buffer, for slicing out words
+        self._index = None    # word -> index, built on first lookup
+        self._letters = None
+        self._all_ids = None
+        self._orders = {}     # key -> (order, rank), see ranked()
+
+    def __reduce__(self):
+        # Pickle only the buffer (worker processes rebuild caches lazily)
+        return (WordBank.from_buffer, (self.buffer, self.word_length))
+
+    # --- Sequence API ---
+    def __len__(self):
+        return len(self.buffer) // self.word_length if self.word_length else 0
+
+    def __getitem__(self, i):
+        L = self.word_length
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step == 1:
+                return WordBank.from_buffer(self.buffer[start * L:stop * L], L)
+            return WordBank([self[j] for j in range(start, stop, step)], L)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("WordBank index out of range")
+        return self.text[i * L:(i + 1) * L]
+
+    def __iter__(self):
+        text, L = self.text, self.word_length
+        for start in range(0, len(text), L):
+            yield text[start:start + L]
+
+    def __contains__(self, word):
+        return self.index_of(word) is not None
+
+    def __eq__(self, other):
+        if isinstance(other, WordBank):
+            return self.word_length == other.word_length and self.buffer == other.buffer
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"WordBank({len(self)} words, length {self.word_length})"
+
+    def index(self, word, *args):
+        i = self.index_of(word)
+        if i is None:
+            raise ValueError(f"{word!r} is not in the word bank")
+        return i
+
+    # --- Lookups ---
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.buffer.decode("ascii")
+        return self._text
+
+    def index_of(self, word):
+        """Index of `word`, or None if it is not in the bank."""
+        if self._index is None:
+            self._index = {w: i for i, w in enumerate(self)}
+        return self._index.get(word)
+
+    def words_for(self, ids):
+        """Words at the given indices (an index array, range or list)."""
+        if HAS_NUMPY and isinstance(ids, np.ndarray):
+            ids = ids.tolist()
+        text, L = self.text, self.word_length
+        return [text[i * L:(i + 1) * L] for i in ids]
+
+    def ranked(self, key, score):
+        """
+        (order, rank) of the words sorted by (score(word), word), computed
+        once per `key`: order[r] is the index of the r-th word and rank[i]
+        the position of word i (an int32 array with numpy, else a list).
+        """
+        if key not in self._orders:
+            words = list(self)
+            order = sorted(range(len(words)), key=lambda i: (score(words[i]), words[i]))
+            rank = [0] * len(words)
+            for r, i in enumerate(order):
+                rank[i] = r
+            if HAS_NUMPY:
+                rank = np.array(rank, dtype=np.int32)
+                rank.flags.writeable = False
+            self._orders[key] = (order, rank)
+        return self._orders[key]
+
+    # --- Vector views ---
+    @property
+    def letters(self):
+        """(N, L) uint8 array of letter codes 0-25 (read-only, cached)."""
+        if self._letters is None:
+            letters = np.frombuffer(self.buffer, dtype=np.uint8).reshape(len(self), self.word_length) - ord("a")
+            letters.flags.writeable = False
+            self._letters = letters
+        return self._letters
+
+    def all_ids(self):
+        """Every index, shared read-only, so a full candidate set costs nothing."""
+        if self._all_ids is None:
+            if HAS_NUMPY:
+                ids = np.arange(len(self), dtype=np.int32)
+                ids.flags.writeable = False
+            else:
+                ids = range(len(self))
+            self._all_ids = ids
+        return self._all_ids
+
+    @property
+    def full_mask(self):
+        """Bitset with one bit per word."""
+        return (1 << len(self)) - 1
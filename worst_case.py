@@ -0,0 +1,135 @@
+# worst_case.py
+"""
+Tail behaviour of the solvers rather than their average luck.
+
+    python worst_case.py --workers 8
+    python worst_case.py --solvers Entropy A* --top 20 --hard --json worst.json
+    python worst_case.py --adversarial-only --max-guesses 12
+
+Every solver plays every word of the list as the secret, which gives its
+exact worst case over the list and the secrets that reach it. It then
+plays one game.AdversarialGame: the game keeps every consistent answer and
+always gives the feedback of the largest bucket, so the solver is chased
+down its worst branch. That game goes on past MAX_ATTEMPTS (up to
+--max-guesses) to show how many guesses the solver needs to corner it.
+"""
+import sys
+import json
+import time
+import argparse
+from config import Config
+from benchmark import PerformanceBenchmark, MAX_ATTEMPTS
+from benchmark_suite import game_scores, FAILED_SCORE
+from constraints import ConstraintIndex
+from game import AdversarialGame
+from opening_book import OpeningBook
+from patterns import PatternTable, HAS_NUMPY
+from solvers import SOLVER_REGISTRY
+from utils import load_words, load_guesses, words_file
+
+
+def worst_secrets(bench, top=10):
+    """(worst score, secrets at that score, the `top` highest-scoring (secret, score) pairs)."""
+    ranked = sorted(game_scores(bench).items(), key=lambda item: (-item[1], item[0]))
+    if not ranked:
+        return None, [], []
+    worst = ranked[0][1]
+    return worst, [secret for secret, score in ranked if score == worst], ranked[:top]
+
+
+def play_adversarial(word_list, solver_class, pattern_table=None, hard_mode=Config.HARD_MODE, guess_list=None,
+                     max_guesses=2 * MAX_ATTEMPTS, use_book=True):
+    """
+    Plays one adversarial game until the solver corners the adversary or
+    `max_guesses` are used; returns the game record with the number of
+    answers still consistent after each guess.
+    """
+    index = ConstraintIndex(word_list) if pattern_table is None else None
+    game = AdversarialGame(word_list, pattern_table, index, hard_mode, guess_list)
+    solver = solver_class(game)
+    solver.opening_book = OpeningBook.load(solver_class, word_list, hard_mode=hard_mode,
+                                           guess_list=game.allowed_guesses) if use_book else None
+    solver.reset()
+    path, survivors, solved = [], [], False
+    start = time.perf_counter()
+    while not solved and len(path) < max_guesses:
+        guess = solver.solve_step()
+        if not guess:
+            break
+        feedback = game.check_guess(guess)
+        solver.filter_candidates(guess, feedback)
+        path.append(guess)
+        survivors.append(game.survivor_count())
+        solved = all(f == 2 for f in feedback)
+    return {"guesses": len(path), "solved": solved, "won": solved and len(path) <= MAX_ATTEMPTS, "path": path,
+            "survivors": survivors, "secret": game.secret_word if solved else None,
+            "time_ms": (time.perf_counter() - start) * 1000}
+
+
+def analyze(word_list, solver_classes, pattern_table=None, workers=1, top=10, hard_mode=Config.HARD_MODE,
+            guess_list=None, max_guesses=2 * MAX_ATTEMPTS, exhaustive=True):
+    """Worst-case report for each solver: exhaustive play over the list, then the adversarial game."""
+    report = {"word_length": len(word_list[0]) if word_list else Config.WORD_LENGTH, "hard_mode": hard_mode,
+              "secrets": len(word_list) if exhaustive else 0, "solvers": {}}
+    for name, solver_class in solver_classes.items():
+        entry = {}
+        if exhaustive:
+            bench = PerformanceBenchmark(word_list, solver_class, pattern_table=pattern_table, measure_memory=False,
+                                         keep_records=True, hard_mode=hard_mode, guess_list=guess_list)
+            stats = bench.run_parallel(word_list, workers=workers) if workers > 1 else bench.run(secrets=word_list)
+            worst, at_worst, ranked = worst_secrets(bench, top)
+            entry.update(avg_guesses=stats["avg_guesses"], losses=sum(not r["won"] for r in bench.records),
+                         worst=worst, at_worst=len(at_worst), worst_secrets=ranked)
+        entry["adversarial"] = play_adversarial(word_list, solver_class, pattern_table, hard_mode, guess_list,
+                                                max_guesses)
+        report["solvers"][name] = entry
+    return report
+
+
+def format_score(score):
+    return "X" if score == FAILED_SCORE else str(score)
+
+
+def print_report(report):
+    mode = ", hard mode" if report["hard_mode"] else ""
+    print(f"{report['word_length']} letters{mode}" +
+          (f": every one of {report['secrets']} secrets per solver" if report["secrets"] else ""))
+    for name, s in report["solvers"].items():
+        if "worst" in s:
+            secrets = " ".join(f"{secret}:{format_score(score)}" for secret, score in s["worst_secrets"])
+            print(f"  {name:8} avg {s['avg_guesses']:.3f}  worst {format_score(s['worst'])} "
+                  f"({s['at_worst']} secrets, {s['losses']} lost)  [{secrets}]")
+        adv = s["adversarial"]
+        outcome = f"cornered in {adv['guesses']}" if adv["solved"] else f"not cornered in {adv['guesses']}"
+        steps = " ".join(f"{guess}({left})" for guess, left in zip(adv["path"], adv["survivors"]))
+        print(f"  {name:8} adversary {outcome} ({adv['time_ms']:.1f} ms): {steps}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find each solver's worst-case secrets and play it against an adversary.")
+    parser.add_argument("--solvers", nargs="*", default=None, help="solver names (default: all)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes per solver")
+    parser.add_argument("--top", type=int, default=10, help="worst secrets listed per solver")
+    parser.add_argument("--max-guesses", type=int, default=2 * MAX_ATTEMPTS, help="guess cap of the adversarial game")
+    parser.add_argument("--adversarial-only", action="store_true", help="skip playing every secret")
+    parser.add_argument("--words", default=None, help="word list file (default: the list for --length)")
+    parser.add_argument("--guesses", default=None, help="allowed-guess list (default: the list for --length)")
+    parser.add_argument("--length", type=int, default=Config.WORD_LENGTH, help="word length")
+    parser.add_argument("--hard", action="store_true", help="play in hard mode")
+    parser.add_argument("--json", help="write the report as JSON")
+    args = parser.parse_args()
+
+    words = load_words(args.words, args.length)
+    if not words:
+        sys.exit(f"no {args.length}-letter words in {args.words or words_file(args.length)}")
+    guesses = load_guesses(words, args.guesses)
+    table = PatternTable.load(words, guesses) if HAS_NUMPY else None
+    names = args.solvers or list(SOLVER_REGISTRY)
+    solver_classes = {name: SOLVER_REGISTRY[name] for name in names
+                      if table is not None or not SOLVER_REGISTRY[name].REQUIRES_TABLE}
+    report = analyze(words, solver_classes, table, args.workers, args.top, args.hard, guesses, args.max_guesses,
+                     exhaustive=not args.adversarial_only)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)